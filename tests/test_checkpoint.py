@@ -0,0 +1,30 @@
+from vault.core.checkpoint import Checkpoint
+
+
+def test_retry_targets_skips_completed():
+    checkpoint = Checkpoint(
+        operation="apply",
+        planned=["aws_s3_bucket.b", "aws_iam_role.a", "aws_instance.c"],
+        completed=["aws_iam_role.a"]
+    )
+    assert checkpoint.retry_targets == ["aws_instance.c", "aws_s3_bucket.b"]
+
+
+def test_retry_targets_includes_errored():
+    # An errored resource may have been completed before a later failure
+    checkpoint = Checkpoint(
+        operation="apply",
+        planned=["a.x", "b.y"],
+        completed=["a.x", "b.y"],
+        errored=["b.y", "c.z"]
+    )
+    assert checkpoint.retry_targets == ["b.y", "c.z"]
+
+
+def test_retry_targets_empty_when_nothing_streamed():
+    assert Checkpoint(operation="destroy").retry_targets == []
+
+
+def test_retry_targets_empty_when_all_completed():
+    checkpoint = Checkpoint(operation="apply", planned=["a.x"], completed=["a.x"])
+    assert checkpoint.retry_targets == []
@@ -0,0 +1,88 @@
+import json
+
+from vault.core.events import EventKind, parse_event
+
+
+def test_parse_apply_complete():
+    line = json.dumps({
+        "@level": "info",
+        "@message": "aws_s3_bucket.lab: Creation complete after 2s",
+        "@timestamp": "2025-01-31T10:00:00.000000Z",
+        "type": "apply_complete",
+        "hook": {
+            "resource": {"addr": "aws_s3_bucket.lab", "resource_type": "aws_s3_bucket"},
+            "action": "create",
+            "elapsed_seconds": 2
+        }
+    })
+    
+    event = parse_event(line)
+    assert event.kind == EventKind.RESOURCE_COMPLETE
+    assert event.address == "aws_s3_bucket.lab"
+    assert event.resource_type == "aws_s3_bucket"
+    assert event.action == "create"
+    assert event.elapsed == 2.0
+    assert event.timestamp.isoformat() == "2025-01-31T10:00:00+00:00"
+    assert not event.is_error
+    assert not event.raw
+
+
+def test_parse_planned_change():
+    line = json.dumps({
+        "type": "planned_change",
+        "change": {"resource": {"addr": "module.vpc.aws_vpc.main"}, "action": "create"}
+    })
+    
+    event = parse_event(line)
+    assert event.kind == EventKind.PLANNED_CHANGE
+    assert event.address == "module.vpc.aws_vpc.main"
+    assert event.action == "create"
+
+
+def test_parse_change_summary():
+    line = json.dumps({
+        "type": "change_summary",
+        "changes": {"add": 3, "change": 1, "remove": 2, "operation": "apply"}
+    })
+    
+    event = parse_event(line)
+    assert event.kind == EventKind.CHANGE_SUMMARY
+    assert event.change_count == 6
+    assert event.operation == "apply"
+
+
+def test_parse_error_diagnostic():
+    event = parse_event(json.dumps({"@level": "error", "@message": "Error: boom", "type": "diagnostic"}))
+    assert event.kind == EventKind.DIAGNOSTIC
+    assert event.is_error
+
+
+def test_parse_apply_errored_is_error():
+    event = parse_event(json.dumps({"type": "apply_errored", "hook": {"resource": {"addr": "a.b"}}}))
+    assert event.kind == EventKind.RESOURCE_ERROR
+    assert event.is_error
+
+
+def test_unknown_type_is_log():
+    event = parse_event(json.dumps({"type": "version", "@message": "Terraform 1.7.5"}))
+    assert event.kind == EventKind.LOG
+    assert event.message == "Terraform 1.7.5"
+    assert not event.raw
+
+
+def test_plain_text_is_raw_log():
+    event = parse_event("panic: runtime error\n")
+    assert event.kind == EventKind.LOG
+    assert event.message == "panic: runtime error"
+    assert event.raw
+
+
+def test_blank_and_non_object_lines_are_skipped():
+    assert parse_event("") is None
+    assert parse_event("   \n") is None
+    assert parse_event("[1, 2]") is None
+
+
+def test_bad_timestamp_falls_back_to_now():
+    event = parse_event(json.dumps({"type": "log", "@timestamp": "yesterday"}))
+    assert event.timestamp.tzinfo is not None
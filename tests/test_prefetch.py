@@ -0,0 +1,108 @@
+from pathlib import Path
+
+from vault.core.lab import CloudProvider, Lab
+from vault.core.prefetch import collect_provider_requirements
+
+
+def _lab(labs_dir: Path, path: str, main_tf: str) -> Lab:
+    provider, name = path.split("/")
+    lab_dir = labs_dir / path
+    lab_dir.mkdir(parents=True)
+    (lab_dir / "main.tf").write_text(main_tf)
+    return Lab(name=name, path=lab_dir, provider=CloudProvider(provider))
+
+
+def test_collects_sources_constraints_and_labs(tmp_path):
+    first = _lab(tmp_path, "aws/first", """
+terraform {
+  required_providers {
+    aws = {
+      source  = "hashicorp/aws"
+      version = "~> 5.0"
+    }
+    random = {
+      source = "hashicorp/random"
+    }
+  }
+}
+""")
+    second = _lab(tmp_path, "aws/second", """
+terraform {
+  required_providers {
+    aws = {
+      source  = "HashiCorp/AWS"
+      version = ">= 5.10"
+    }
+  }
+}
+""")
+
+    requirements = collect_provider_requirements([first, second])
+    
+    assert set(requirements) == {"hashicorp/aws", "hashicorp/random"}
+    aws = requirements["hashicorp/aws"]
+    assert aws.constraints == {"~> 5.0", ">= 5.10"}
+    assert aws.labs == {"aws/first", "aws/second"}
+    assert aws.address == "registry.terraform.io/hashicorp/aws"
+    assert aws.local_name == "aws"
+    assert requirements["hashicorp/random"].constraints == set()
+
+
+def test_legacy_shorthand_defaults_to_hashicorp(tmp_path):
+    lab = _lab(tmp_path, "gcp/legacy", """
+terraform {
+  required_providers {
+    google = "~> 4.0"
+  }
+}
+""")
+
+    requirements = collect_provider_requirements([lab])
+    assert requirements["hashicorp/google"].constraints == {"~> 4.0"}
+
+
+def test_includes_local_module_providers(tmp_path):
+    module_dir = tmp_path / "aws" / "modules" / "network"
+    module_dir.mkdir(parents=True)
+    (module_dir / "main.tf").write_text("""
+terraform {
+  required_providers {
+    tls = {
+      source = "hashicorp/tls"
+    }
+  }
+}
+""")
+    lab = _lab(tmp_path, "aws/with-module", """
+module "network" {
+  source = "../modules/network"
+}
+""")
+
+    requirements = collect_provider_requirements([lab])
+    assert requirements["hashicorp/tls"].labs == {"aws/with-module"}
+
+
+def test_locked_version_is_pinned(tmp_path):
+    lab = _lab(tmp_path, "azure/locked", """
+terraform {
+  required_providers {
+    azurerm = {
+      source  = "hashicorp/azurerm"
+      version = "~> 3.0"
+    }
+  }
+}
+""")
+    (lab.path / ".terraform.lock.hcl").write_text("""
+provider "registry.terraform.io/hashicorp/azurerm" {
+  version     = "3.85.0"
+  constraints = "~> 3.0"
+  hashes = [
+    "h1:abc=",
+  ]
+}
+""")
+
+    requirements = collect_provider_requirements([lab])
+    assert requirements["hashicorp/azurerm"].constraints == {"~> 3.0", "= 3.85.0"}
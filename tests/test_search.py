@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from vault.core.lab import CloudProvider, Lab
+from vault.utils.search import LabDiscovery
+
+
+def _labs(*paths: str) -> list[Lab]:
+    labs = []
+    for path in paths:
+        provider, name = path.split("/")
+        labs.append(Lab(name=name, path=Path("labs") / path, provider=CloudProvider(provider)))
+    return labs
+
+
+def test_assign_ids_numbers_new_labs_in_order():
+    ids = LabDiscovery._assign_ids(_labs("aws/a", "aws/b", "gcp/c"), {})
+    assert ids == {"aws/a": 1, "aws/b": 2, "gcp/c": 3}
+
+
+def test_assign_ids_keeps_known_ids():
+    known = {"aws/b": 1, "gcp/c": 2}
+    ids = LabDiscovery._assign_ids(_labs("aws/a", "aws/b", "gcp/c"), known)
+    assert ids == {"aws/b": 1, "gcp/c": 2, "aws/a": 3}
+
+
+def test_assign_ids_never_reuses_retired_ids():
+    known = {"aws/a": 1, "aws/b": 2, "gcp/c": 3}
+    ids = LabDiscovery._assign_ids(_labs("aws/a", "gcp/c", "gcp/d"), known)
+    assert ids["aws/a"] == 1
+    assert ids["gcp/c"] == 3
+    assert ids["gcp/d"] == 4
+
+
+def test_assign_ids_does_not_modify_known():
+    known = {"aws/a": 1}
+    LabDiscovery._assign_ids(_labs("aws/a", "aws/b"), known)
+    assert known == {"aws/a": 1}
+
+
+def test_lab_ids_persist_across_discovery(tmp_path):
+    labs_dir = tmp_path / "labs"
+    for path in ("aws/zeta", "gcp/alpha"):
+        (labs_dir / path).mkdir(parents=True)
+        (labs_dir / path / "main.tf").write_text("")
+    cache_file = tmp_path / "lab-catalog.json"
+    
+    first = LabDiscovery(labs_dir, cache_file=cache_file).lab_ids()
+    
+    # A lab sorting ahead of the others must not shift their IDs
+    (labs_dir / "aws/alpha").mkdir()
+    (labs_dir / "aws/alpha/main.tf").write_text("")
+    second = LabDiscovery(labs_dir, cache_file=cache_file).lab_ids()
+    
+    assert second["aws/zeta"] == first["aws/zeta"]
+    assert second["gcp/alpha"] == first["gcp/alpha"]
+    assert second["aws/alpha"] == max(first.values()) + 1
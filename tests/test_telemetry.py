@@ -0,0 +1,30 @@
+import pytest
+
+from vault.core.telemetry import percentile
+
+
+def test_percentile_empty():
+    assert percentile([], 50) == 0.0
+
+
+def test_percentile_single_value():
+    assert percentile([4.2], 0) == 4.2
+    assert percentile([4.2], 95) == 4.2
+
+
+def test_percentile_bounds():
+    values = [5.0, 1.0, 3.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 100) == 5.0
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+    assert percentile(values, 50) == pytest.approx(25.0)
+    assert percentile(values, 95) == pytest.approx(38.5)
+
+
+def test_percentile_does_not_sort_in_place():
+    values = [3.0, 1.0, 2.0]
+    percentile(values, 50)
+    assert values == [3.0, 1.0, 2.0]
@@ -0,0 +1,101 @@
+import io
+import json
+
+import pytest
+
+from vault.core import tfstate
+from vault.core.tfstate import TFStateError, read_tfstate
+
+
+def _state() -> dict:
+    return {
+        "version": 4,
+        "terraform_version": "1.7.5",
+        "serial": 1234567,
+        "lineage": "3f2e1d0c-aaaa-bbbb-cccc-0123456789ab",
+        "outputs": {
+            "bucket": {"value": "vault-lab-bucket", "type": "string"},
+            "ports": {"value": [22, 80, 443], "type": ["list", "number"]},
+            "password": {"value": "s3cr3t", "type": "string", "sensitive": True}
+        },
+        "resources": [
+            {
+                "mode": "managed",
+                "type": "aws_s3_bucket",
+                "name": "lab",
+                "provider": 'provider["registry.terraform.io/hashicorp/aws"]',
+                "instances": [
+                    {"schema_version": 0, "attributes": {"policy": "x" * 5000, "tags": {"a": "}{"}}}
+                ]
+            },
+            {
+                "module": "module.vpc",
+                "mode": "data",
+                "type": "aws_iam_policy_document",
+                "name": "assume",
+                "instances": [{"index_key": 0, "status": "tainted", "attributes": {"json": "{\"a\": 1}"}}]
+            },
+            {
+                "mode": "managed",
+                "type": "aws_instance",
+                "name": "web",
+                "status": "error",
+                "instances": [{"deposed": "00000001", "attributes": {"count": 12345678901234567890}}]
+            }
+        ],
+        "check_results": None
+    }
+
+
+def _expected(state: dict) -> dict:
+    # What the streaming reader keeps, derived from a plain json.load
+    return {
+        "serial": state["serial"],
+        "lineage": state["lineage"],
+        "outputs": state["outputs"],
+        "resources": [
+            {
+                **{key: resource[key] for key in tfstate._RESOURCE_KEYS if key in resource},
+                "instances": [
+                    {key: instance[key] for key in tfstate._INSTANCE_KEYS if key in instance}
+                    for instance in resource["instances"]
+                ]
+            }
+            for resource in state["resources"]
+        ]
+    }
+
+
+def _read(text: str):
+    snapshot = read_tfstate(io.StringIO(text))
+    return {
+        "serial": snapshot.serial,
+        "lineage": snapshot.lineage,
+        "outputs": snapshot.outputs,
+        "resources": snapshot.resources
+    }
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_read_tfstate_matches_json_load(monkeypatch, indent, chunk_size):
+    # Small chunks split keys, strings and numbers across reads
+    monkeypatch.setattr(tfstate, "_CHUNK_SIZE", chunk_size)
+    text = json.dumps(_state(), indent=indent)
+    assert _read(text) == _expected(json.loads(text))
+
+
+def test_read_tfstate_empty_object():
+    snapshot = read_tfstate(io.StringIO("{}"))
+    assert (snapshot.serial, snapshot.lineage, snapshot.resources, snapshot.outputs) == (0, "", [], {})
+
+
+def test_read_tfstate_no_resources():
+    text = json.dumps({"serial": 3, "lineage": "abc", "resources": [], "outputs": {}})
+    assert _read(text) == {"serial": 3, "lineage": "abc", "outputs": {}, "resources": []}
+
+
+@pytest.mark.parametrize("text", ["", "[]", '{"serial": 1', '{"resources": [{"type": "x"}'])
+def test_read_tfstate_rejects_malformed(text):
+    with pytest.raises(TFStateError):
+        read_tfstate(io.StringIO(text))
@@ -44,11 +44,23 @@ def cli(ctx):
 
 @cli.command()
 @click.argument("query", required=False)
-def list(query):
+@click.option("-p", "--provider", "providers", multiple=True, type=click.Choice(["aws", "azure", "gcp"]), help="Only labs for this provider (repeatable)")
+@click.option("-d", "--difficulty", help="Difficulty rating or range, e.g. 5, 5-7 or 3,8")
+@click.option("-t", "--tag", "tags", multiple=True, help="Keyword in the lab name, description or objectives (repeatable)")
+@click.option("-r", "--resource", "resource_types", multiple=True, help="Terraform resource type the lab creates (repeatable)")
+@click.option("--match-all", is_flag=True, help="Require every --tag/--resource instead of any")
+def list(query, providers, difficulty, tags, resource_types, match_all):
     """List available labs"""
     labs_dir, state_dir, config_dir, _ = get_project_paths()
     handler = CommandHandler(labs_dir, state_dir, config_dir)
-    handler.cmd_list(query)
+    handler.cmd_list(
+        query,
+        providers=[*providers],
+        difficulty=difficulty,
+        tags=[*tags],
+        resource_types=[*resource_types],
+        match_all=match_all
+    )
 
 
 @cli.command()
@@ -68,7 +80,8 @@ def init(lab):
 @cli.command()
 @click.argument("lab")
 @click.option("--destroy", is_flag=True, help="Show destroy plan")
-def plan(lab, destroy):
+@click.option("--refresh", is_flag=True, help="Ignore the cached plan and re-run terraform plan")
+def plan(lab, destroy, refresh):
     """Show terraform plan without deploying"""
     labs_dir, state_dir, config_dir, _ = get_project_paths()
     handler = CommandHandler(labs_dir, state_dir, config_dir)
@@ -76,36 +89,65 @@ def plan(lab, destroy):
     if not handler.cmd_use(lab):
         sys.exit(1)
     
-    handler.cmd_plan(destroy=destroy)
+    handler.cmd_plan(destroy=destroy, refresh=refresh)
 
 
 @cli.command()
-@click.argument("lab")
+@click.argument("labs", nargs=-1, required=True)
 @click.option("-y", "--auto-approve", is_flag=True, help="Skip confirmation prompts")
-def deploy(lab, auto_approve):
-    """Deploy a lab"""
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=4, show_default=True, help="Labs to deploy concurrently")
+@click.option("--resume", is_flag=True, help="Retry only the resources left over by an interrupted deploy")
+def deploy(labs, auto_approve, jobs, resume):
+    """Deploy one or more labs"""
     labs_dir, state_dir, config_dir, _ = get_project_paths()
     handler = CommandHandler(labs_dir, state_dir, config_dir)
     
-    if not handler.cmd_use(lab):
+    if resume and len(labs) > 1:
+        raise click.UsageError("--resume works on a single lab")
+    
+    if len(labs) > 1:
+        if not handler.cmd_deploy_many([*labs], jobs=jobs, auto_approve=auto_approve):
+            sys.exit(1)
+        return
+    
+    if not handler.cmd_use(labs[0]):
         sys.exit(1)
     
-    if not handler.cmd_deploy(auto_approve=auto_approve):
+    if not handler.cmd_deploy(auto_approve=auto_approve, resume=resume):
         sys.exit(1)
 
 
 @cli.command()
-@click.argument("lab")
+@click.argument("labs", nargs=-1)
 @click.option("-y", "--auto-approve", is_flag=True, help="Skip confirmation prompts")
-def destroy(lab, auto_approve):
-    """Destroy a lab"""
+@click.option("-a", "--all", "destroy_all", is_flag=True, help="Destroy all active deployments")
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=4, show_default=True, help="Labs to destroy concurrently")
+@click.option("--resume", is_flag=True, help="Retry only the resources left over by an interrupted destroy")
+def destroy(labs, auto_approve, destroy_all, jobs, resume):
+    """Destroy one or more labs"""
     labs_dir, state_dir, config_dir, _ = get_project_paths()
     handler = CommandHandler(labs_dir, state_dir, config_dir)
     
-    if not handler.cmd_use(lab):
+    if not labs and not destroy_all:
+        raise click.UsageError("Specify at least one lab or --all")
+    
+    if resume and (len(labs) > 1 or destroy_all):
+        raise click.UsageError("--resume works on a single lab")
+    
+    if len(labs) > 1 or destroy_all:
+        if not handler.cmd_destroy_many(
+            [*labs],
+            jobs=jobs,
+            auto_approve=auto_approve,
+            destroy_all=destroy_all
+        ):
+            sys.exit(1)
+        return
+    
+    if not handler.cmd_use(labs[0]):
         sys.exit(1)
     
-    if not handler.cmd_destroy(auto_approve=auto_approve):
+    if not handler.cmd_destroy(auto_approve=auto_approve, resume=resume):
         sys.exit(1)
 
 
@@ -125,7 +167,14 @@ def outputs(lab, sensitive):
 
 @cli.command()
 @click.argument("lab", required=False)
-def status(lab):
+@click.option("-t", "--type", "resource_type", help="Only show resources of this type (e.g. aws_iam_role)")
+@click.option(
+    "-c",
+    "--category",
+    type=click.Choice(["compute", "storage", "identity", "secrets", "database", "network", "other"]),
+    help="Only show resources in this category"
+)
+def status(lab, resource_type, category):
     """Show lab status"""
     labs_dir, state_dir, config_dir, _ = get_project_paths()
     handler = CommandHandler(labs_dir, state_dir, config_dir)
@@ -134,7 +183,7 @@ def status(lab):
         if not handler.cmd_use(lab):
             sys.exit(1)
     
-    handler.cmd_status()
+    handler.cmd_status(resource_type=resource_type, category=category)
 
 
 @cli.command()
@@ -145,6 +194,38 @@ def active():
     handler.cmd_active()
 
 
+@cli.command()
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=4, show_default=True, help="Labs to check concurrently")
+def drift(jobs):
+    """Detect drift in active deployments"""
+    labs_dir, state_dir, config_dir, _ = get_project_paths()
+    handler = CommandHandler(labs_dir, state_dir, config_dir)
+    
+    if not handler.cmd_drift(jobs=jobs):
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("lab", required=False)
+@click.option("--since", help="Only show events since e.g. 7d, 12h or 2025-01-31")
+@click.option("-u", "--user", help="Only show events by this user")
+@click.option("-n", "--limit", type=click.IntRange(min=1), default=50, show_default=True, help="Maximum events to show")
+def history(lab, since, user, limit):
+    """Show deployment history"""
+    labs_dir, state_dir, config_dir, _ = get_project_paths()
+    handler = CommandHandler(labs_dir, state_dir, config_dir)
+    handler.cmd_history(lab, since=since, user=user, limit=limit)
+
+
+@cli.command()
+@click.argument("lab", required=False)
+def stats(lab):
+    """Show deployment timing statistics"""
+    labs_dir, state_dir, config_dir, _ = get_project_paths()
+    handler = CommandHandler(labs_dir, state_dir, config_dir)
+    handler.cmd_stats(lab)
+
+
 @cli.command()
 def search(query):
     """Search for labs"""
@@ -170,6 +251,19 @@ def check():
     handler.cmd_check()
 
 
+@cli.command()
+@click.option("-j", "--jobs", type=click.IntRange(min=1), default=4, show_default=True, help="Providers to download concurrently")
+@click.option("-p", "--platform", "platforms", multiple=True, help="Target platform(s), e.g. linux_amd64 (default: current)")
+@click.option("--mirror-dir", type=click.Path(file_okay=False, path_type=Path), help="Filesystem mirror location")
+def prefetch(jobs, platforms, mirror_dir):
+    """Download all lab providers into a local filesystem mirror"""
+    labs_dir, state_dir, config_dir, _ = get_project_paths()
+    handler = CommandHandler(labs_dir, state_dir, config_dir)
+    
+    if not handler.cmd_prefetch(jobs=jobs, platforms=[*platforms] or None, mirror_dir=mirror_dir):
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument("tool", type=click.Choice(["aws", "az", "gcloud", "terraform"]))
 def install(tool):
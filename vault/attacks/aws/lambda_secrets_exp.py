@@ -12,8 +12,14 @@ class LambdaSecretsExposure(BaseAttackChain):
     Chain: API Gateway → Lambda env vars → Secrets Manager → RDS
     """
     
-    def __init__(self, outputs: dict, verbose: bool = False, log_file: str | None = None):
-        super().__init__(outputs, verbose, log_file)
+    def __init__(
+        self,
+        outputs: dict,
+        verbose: bool = False,
+        log_file: str | None = None,
+        output_details: dict | None = None
+    ):
+        super().__init__(outputs, verbose, log_file, output_details)
         self.api_endpoint = outputs.get('api_endpoint')
         self.secret_arn = None
         self.db_credentials = None
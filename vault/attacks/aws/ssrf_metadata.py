@@ -15,8 +15,14 @@ except ImportError:
 
 @register_attack("aws", "ssrf-metadata")
 class SSRFMetadataAttack(BaseAttackChain):
-    def __init__(self, outputs: dict[str, Any], verbose: bool = False, log_file: str | None = None):
-        super().__init__(outputs, verbose, log_file)
+    def __init__(
+        self,
+        outputs: dict[str, Any],
+        verbose: bool = False,
+        log_file: str | None = None,
+        output_details: dict[str, Any] | None = None
+    ):
+        super().__init__(outputs, verbose, log_file, output_details)
         self.credentials: dict[str, str] = {}
         
     def run(self) -> list[AttackResult]:
@@ -22,12 +22,20 @@ class AttackResult:
 
 
 class BaseAttackChain(ABC):
-    def __init__(self, outputs: dict[str, Any], verbose: bool = False, log_file: str | None = None):
+    def __init__(
+        self,
+        outputs: dict[str, Any],
+        verbose: bool = False,
+        log_file: str | None = None,
+        output_details: dict[str, Any] | None = None
+    ):
         self.outputs = outputs
         self.results: list[AttackResult] = []
         self.verbose = verbose
         self.log_file = log_file
         self.verbose_buffer: list[str] = []
+        # Full TerraformOutput records (value, type, sensitive) keyed like outputs
+        self.output_details: dict[str, Any] = output_details or {}
         
     @abstractmethod
     def run(self) -> list[AttackResult]:
@@ -78,6 +86,9 @@ class BaseAttackChain(ABC):
         log_data = {
             "timestamp": datetime.now().isoformat(),
             "outputs": self.outputs,
+            "output_types": {
+                key: output.type for key, output in self.output_details.items()
+            },
             "phases": []
         }
         
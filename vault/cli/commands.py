@@ -1,7 +1,9 @@
 import os
+import re
 import subprocess
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional
 
 from rich.prompt import Confirm
 
@@ -12,18 +14,34 @@ from vault.cli.formatting import (
     log_success,
     log_warning,
     print_active_deployments,
+    print_batch_results,
     print_deployment_result,
+    print_drift_report,
+    print_history,
     print_lab_info,
     print_labs_table,
     print_outputs,
     print_status,
+    print_timing_report,
+    terraform_progress,
+)
+from vault.core.batch import BatchOperation, BatchResult, BatchRunner, ProgressCallback
+from vault.core.checkpoint import Checkpoint
+from vault.core.events import EventKind, TerraformEvent
+from vault.core.lab import Lab, PlanResult
+from vault.core.prefetch import (
+    DEFAULT_MIRROR_DIR,
+    MirrorResult,
+    ProviderMirror,
+    collect_provider_requirements,
+    current_platform,
+    user_cli_config,
 )
-from vault.core.lab import Lab
 from vault.core.state import StateManager
 from vault.core.terraform import TerraformError, TerraformWrapper
-from vault.providers.base import ProviderFactory
+from vault.providers.base import BaseProvider, ProviderFactory
 from vault.utils.installer import CSPInstaller
-from vault.utils.search import LabDiscovery
+from vault.utils.search import AmbiguousLabError, LabDiscovery
 from vault.utils.git import GitRepo
 
 class CommandHandler:
@@ -37,43 +55,75 @@ class CommandHandler:
         self.state_dir = state_dir
         self.config_dir = config_dir
         
-        self.discovery = LabDiscovery(labs_dir)
         self.state_manager = StateManager(state_dir)
-        self.terraform = TerraformWrapper(state_dir)
+        self.discovery = LabDiscovery(
+            labs_dir,
+            cache_file=state_dir / "lab-catalog.json",
+            hcl_index=self.state_manager.hcl_index
+        )
+        self.terraform = TerraformWrapper(self.state_manager)
         self.installer = CSPInstaller()
         self.git = GitRepo(labs_dir.parent)
         
         self.current_lab: Optional[Lab] = None
     
-    def cmd_list(self, query: Optional[str] = None) -> None:
+    def cmd_list(
+        self,
+        query: Optional[str] = None,
+        providers: Optional[list[str]] = None,
+        difficulty: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        resource_types: Optional[list[str]] = None,
+        match_all: bool = False
+    ) -> None:
+        difficulties = None
+        if difficulty:
+            try:
+                difficulties = self._parse_difficulty(difficulty)
+            except ValueError:
+                log_error(f"Invalid --difficulty value: {difficulty} (use e.g. 5, 5-7 or 3,8)")
+                return
+        
+        filtered = bool(providers or difficulties or tags or resource_types)
+        if filtered:
+            labs = self.discovery.filter_labs(
+                providers=providers,
+                difficulties=difficulties,
+                tags=tags,
+                resource_types=resource_types,
+                match_all=match_all
+            )
+        else:
+            labs = self.discovery.discover_labs()
+        
         if query:
-            results = self.discovery.search_labs(query)
-            labs = [r.lab for r in results]
-            
+            allowed = {lab.relative_path for lab in labs}
+            labs = [
+                r.lab for r in self.discovery.search_labs(query)
+                if r.lab.relative_path in allowed
+            ]
+        
+        if query or filtered:
             if not labs:
-                log_warning(f"No labs found matching '{query}'")
+                log_warning("No labs found matching the given query/filters")
                 return
             
-            log_info(f"Found {len(labs)} lab(s) matching '{query}'")
-        else:
-            labs = self.discovery.discover_labs()
+            log_info(f"Found {len(labs)} matching lab(s)")
         
         deployed = {
             lab_path for lab_path, _ in self.state_manager.get_active_deployments()
         }
         
-        print_labs_table(labs, show_status=True, deployed_labs=deployed)
+        print_labs_table(
+            labs,
+            show_status=True,
+            deployed_labs=deployed,
+            lab_ids=self.discovery.lab_ids()
+        )
     
     def cmd_use(self, lab_identifier: str) -> bool:
-        lab = None
-        
-        if lab_identifier.isdigit():
-            lab = self.discovery.get_lab_by_index(int(lab_identifier) - 1)
-        else:
-            lab = self.discovery.get_lab_by_path(lab_identifier)
-        
+        lab = self._resolve_lab(lab_identifier)
         if not lab:
-            log_error(f"Lab not found: {lab_identifier}")
             return False
         
         self.current_lab = lab
@@ -87,82 +137,412 @@ class CommandHandler:
         
         status = self.state_manager.get_deployment_status(lab)
         metadata = self.state_manager.load_metadata(lab)
-        print_lab_info(lab, metadata, status)
+        print_lab_info(
+            lab,
+            metadata,
+            status,
+            analysis=self.state_manager.analyze(lab),
+            missing=self.state_manager.get_missing_resources(lab)
+        )
         
         if lab.has_readme:
             if Confirm.ask("View full README?", default=False):
                 self._display_readme(lab)
     
-    def cmd_deploy(self, lab_identifier: Optional[str] = None, auto_approve: bool = False) -> bool:
+    def cmd_deploy(
+        self,
+        lab_identifier: Optional[str] = None,
+        auto_approve: bool = False,
+        resume: bool = False
+    ) -> bool:
         lab = self._resolve_lab(lab_identifier)
         if not lab:
             return False
         
-        if self.state_manager.is_deployed(lab):
+        checkpoint = None
+        if resume:
+            checkpoint = self._resume_checkpoint(lab, "apply")
+            if checkpoint is None:
+                return False
+        elif self.state_manager.is_deployed(lab):
             log_warning(f"Lab already deployed: {lab.relative_path}")
             return False
         
+        prepared = self._prepare_deploy(lab)
+        if not prepared:
+            return False
+        provider, var_files = prepared
+        
+        # The saved plan is only kept when the failed apply changed no state, and
+        # it embeds the init fingerprint, so a current plan means both phases are done
+        if checkpoint and checkpoint.phase == "plan" and self.terraform.has_current_plan(lab, var_files):
+            log_info("Init and plan already completed, reusing the saved plan")
+            planned = PlanResult(output="", to_add=len(checkpoint.planned))
+        else:
+            log_info(f"Initializing {lab.provider.value.upper()} lab: {lab.relative_path}")
+            
+            try:
+                self.terraform.init(lab, var_files)
+                log_success("Lab initialized")
+            except TerraformError as e:
+                log_error(f"Initialization failed: {e}")
+                self.state_manager.record_event(lab, "deploy", False, f"init failed: {e}")
+                return False
+            
+            console.print("\n[bold cyan]Deployment Plan:[/bold cyan]\n")
+            try:
+                plan_output = self.terraform.plan(
+                    lab,
+                    var_files,
+                    save_plan=True,
+                    targets=checkpoint.retry_targets if checkpoint else None
+                )
+                console.print(plan_output)
+            except TerraformError as e:
+                log_error(f"Plan failed: {e}")
+                self.state_manager.record_event(lab, "deploy", False, f"plan failed: {e}")
+                return False
+            planned = PlanResult.from_output(plan_output)
+        
+        if not auto_approve:
+            if not Confirm.ask("\n[green]Proceed with deployment?[/green]", default=False):
+                self.terraform.discard_plan(lab)
+                log_info("Deployment cancelled")
+                return False
+        
+        log_info(f"Deploying lab: {lab.relative_path}")
+        
+        with terraform_progress("Applying", total=planned.total_changes or None) as on_event:
+            result = self.terraform.apply(
+                lab,
+                var_files,
+                auto_approve=True,
+                use_saved_plan=True,
+                on_event=on_event
+            )
+        
+        if result.success:
+            region = provider.get_region()
+            self.state_manager.save_metadata(
+                lab,
+                "deployed",
+                os.getenv("USER", "unknown"),
+                region
+            )
+        
+        self.state_manager.record_event(
+            lab,
+            "deploy",
+            result.success,
+            f"{result.resources_created} resource(s)" if result.success else result.error_message or ""
+        )
+        
+        print_deployment_result(result, lab.relative_path)
+        if not result.success and self.terraform.load_checkpoint(lab):
+            log_info("Run 'deploy --resume' to retry only the failed resources")
+        return result.success
+
+    def _prepare_deploy(self, lab: Lab) -> Optional[tuple[BaseProvider, list[Path]]]:
         provider = ProviderFactory.get_provider(lab.provider, self.config_dir)
         
         if not provider.check_prerequisites():
             log_error("Prerequisites check failed")
-            return False
+            return None
         
         var_files = provider.get_var_files(lab)
         if not var_files:
             log_error(f"No configuration file found for {lab.provider.value}")
-            return False
+            return None
         
         for var_file in var_files:
             if not var_file.exists():
                 log_error(f"Configuration file not found: {var_file}")
                 log_info(f"Create {var_file} with required values")
-                return False
-        
-        log_info(f"Initializing {lab.provider.value.upper()} lab: {lab.relative_path}")
+                return None
         
-        try:
-            self.terraform.init(lab, var_files)
-            log_success("Lab initialized")
-        except TerraformError as e:
-            log_error(f"Initialization failed: {e}")
+        return provider, var_files
+    
+    def cmd_deploy_many(
+        self,
+        lab_identifiers: list[str],
+        jobs: int = 4,
+        auto_approve: bool = False
+    ) -> bool:
+        labs = self._resolve_labs(lab_identifiers)
+        if labs is None:
             return False
         
-        console.print("\n[bold cyan]Deployment Plan:[/bold cyan]\n")
-        try:
-            plan_output = self.terraform.plan(lab, var_files)
-            console.print(plan_output)
-        except TerraformError as e:
-            log_error(f"Plan failed: {e}")
+        prepared: dict[str, tuple[BaseProvider, list[Path]]] = {}
+        for lab in labs:
+            if self.state_manager.is_deployed(lab):
+                log_warning(f"Skipping {lab.relative_path}: already deployed")
+                continue
+            
+            lab_prepared = self._prepare_deploy(lab)
+            if not lab_prepared:
+                log_error(f"Cannot deploy {lab.relative_path}")
+                return False
+            prepared[lab.relative_path] = lab_prepared
+        
+        labs = [lab for lab in labs if lab.relative_path in prepared]
+        if not labs:
+            log_warning("Nothing to deploy")
             return False
         
         if not auto_approve:
-            if not Confirm.ask("\n[green]Proceed with deployment?[/green]", default=False):
+            console.print("\n[bold cyan]Labs to deploy:[/bold cyan]")
+            for lab in labs:
+                console.print(f"  • {lab.relative_path}")
+            if not Confirm.ask(f"\n[green]Deploy {len(labs)} lab(s) with {jobs} job(s)?[/green]", default=False):
                 log_info("Deployment cancelled")
                 return False
         
-        log_info(f"Deploying lab: {lab.relative_path}")
+        def deploy_lab(lab: Lab, report: ProgressCallback) -> tuple[bool, str]:
+            provider, var_files = prepared[lab.relative_path]
+            
+            report("initializing")
+            self.terraform.init(lab, var_files)
+            
+            report("applying")
+            completed = 0
+            
+            def on_event(event: TerraformEvent) -> None:
+                nonlocal completed
+                if event.kind == EventKind.RESOURCE_COMPLETE:
+                    completed += 1
+                    report(f"applying ({completed} done)")
+            
+            result = self.terraform.apply(
+                lab,
+                var_files,
+                auto_approve=True,
+                quiet=True,
+                on_event=on_event
+            )
+            if not result.success:
+                return False, result.error_message or "Apply failed"
+            
+            self.state_manager.save_metadata(
+                lab,
+                "deployed",
+                os.getenv("USER", "unknown"),
+                provider.get_region()
+            )
+            return True, f"{result.resources_created} resource(s)"
         
-        result = self.terraform.apply(lab, var_files, auto_approve=True)
+        results = self._run_batch(labs, deploy_lab, jobs)
+        self._record_batch(results, "deploy")
+        print_batch_results(results, "Deployment")
+        return all(r.success for r in results)
+    
+    def cmd_destroy_many(
+        self,
+        lab_identifiers: list[str],
+        jobs: int = 4,
+        auto_approve: bool = False,
+        destroy_all: bool = False
+    ) -> bool:
+        if destroy_all:
+            lab_identifiers = [
+                lab_path for lab_path, _ in self.state_manager.get_active_deployments()
+            ]
+            if not lab_identifiers:
+                log_warning("No active deployments")
+                return True
+        
+        labs = self._resolve_labs(lab_identifiers)
+        if labs is None:
+            return False
         
-        if result.success:
-            region = provider.get_region()
+        labs = [lab for lab in labs if self.state_manager.is_deployed(lab)]
+        if not labs:
+            log_warning("Nothing to destroy")
+            return False
+        
+        if not auto_approve:
+            console.print(
+                "\n[red bold]WARNING:[/red bold] [red]This will destroy all resources for:[/red]"
+            )
+            for lab in labs:
+                console.print(f"  • {lab.relative_path}")
+            
+            confirmation = console.input("\n[yellow]Type 'destroy' to confirm: [/yellow]")
+            if confirmation != "destroy":
+                log_info("Destruction cancelled")
+                return False
+        
+        def destroy_lab(lab: Lab, report: ProgressCallback) -> tuple[bool, str]:
+            provider = ProviderFactory.get_provider(lab.provider, self.config_dir)
+            var_files = provider.get_var_files(lab)
+            
+            report("initializing")
+            self.terraform.init(lab, var_files)
+            
+            report("destroying")
+            remaining: Optional[int] = None
+            
+            def on_event(event: TerraformEvent) -> None:
+                nonlocal remaining
+                if event.kind == EventKind.CHANGE_SUMMARY and event.operation == "plan":
+                    remaining = event.change_count
+                elif event.kind == EventKind.RESOURCE_COMPLETE and remaining:
+                    remaining -= 1
+                    report(f"destroying ({remaining} left)")
+            
+            if not self.terraform.destroy(
+                lab,
+                var_files,
+                auto_approve=True,
+                quiet=True,
+                on_event=on_event
+            ):
+                return False, "Destroy failed"
+            
             self.state_manager.save_metadata(
                 lab,
-                "deployed",
+                "destroyed",
                 os.getenv("USER", "unknown"),
-                region
+                provider.get_region()
             )
+            return True, ""
         
-        print_deployment_result(result, lab.relative_path)
-        return result.success
-
-    def cmd_destroy(self, lab_identifier: Optional[str] = None, auto_approve: bool = False) -> bool:
+        results = self._run_batch(labs, destroy_lab, jobs)
+        self._record_batch(results, "destroy")
+        print_batch_results(results, "Destruction")
+        
+        if self.current_lab and any(
+            r.success and r.lab == self.current_lab for r in results
+        ):
+            self.current_lab = None
+        
+        return all(r.success for r in results)
+    
+    def cmd_drift(self, jobs: int = 4) -> bool:
+        """Check active deployments for drift with refresh-only plans"""
+        labs = []
+        for lab_path, _ in self.state_manager.get_active_deployments():
+            lab = self.discovery.get_lab_by_path(lab_path)
+            if lab:
+                labs.append(lab)
+            else:
+                log_warning(f"Skipping {lab_path}: lab no longer exists")
+        
+        if not labs:
+            log_warning("No active deployments")
+            return True
+        
+        drift: dict[str, list[TerraformEvent]] = {}
+        
+        def check_lab(lab: Lab, report: ProgressCallback) -> tuple[bool, str]:
+            provider = ProviderFactory.get_provider(lab.provider, self.config_dir)
+            var_files = provider.get_var_files(lab)
+            
+            report("refreshing")
+            drifted = self.terraform.detect_drift(lab, var_files)
+            drift[lab.relative_path] = drifted
+            
+            return True, f"{len(drifted)} drifted resource(s)" if drifted else "in sync"
+        
+        results = self._run_batch(labs, check_lab, jobs)
+        self._record_batch(results, "drift")
+        print_batch_results(results, "Drift Check")
+        print_drift_report({lab.relative_path: drift.get(lab.relative_path, []) for lab in labs})
+        return all(r.success for r in results)
+    
+    def _record_batch(self, results: list[BatchResult], action: str) -> None:
+        for result in results:
+            self.state_manager.record_event(result.lab, action, result.success, result.message)
+    
+    def _run_batch(
+        self,
+        labs: list[Lab],
+        operation: BatchOperation,
+        jobs: int
+    ) -> list[BatchResult]:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+        
+        log_info(f"Running {len(labs)} lab(s) with {jobs} job(s)")
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[bold]{task.fields[lab]}[/bold]"),
+            TextColumn("{task.description}"),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+            tasks = {
+                lab.relative_path: progress.add_task("[dim]queued[/dim]", lab=lab.relative_path, total=1)
+                for lab in labs
+            }
+            
+            def on_progress(lab: Lab, phase: str) -> None:
+                task_id = tasks[lab.relative_path]
+                if phase == "done":
+                    progress.update(task_id, description="[green]done[/green]", completed=1)
+                elif phase == "failed":
+                    progress.update(task_id, description="[red]failed[/red]", completed=1)
+                else:
+                    progress.update(task_id, description=f"[cyan]{phase}[/cyan]")
+            
+            return BatchRunner(jobs).run(
+                labs,
+                operation,
+                on_progress,
+                on_interrupt=self.terraform.cancel_all
+            )
+    
+    def _resolve_labs(self, lab_identifiers: list[str]) -> Optional[list[Lab]]:
+        labs = []
+        for lab_identifier in lab_identifiers:
+            lab = self._resolve_lab(lab_identifier)
+            if not lab:
+                return None
+            if lab not in labs:
+                labs.append(lab)
+        return labs
+    
+    def _resume_checkpoint(self, lab: Lab, operation: str) -> Optional[Checkpoint]:
+        checkpoint = self.terraform.load_checkpoint(lab)
+        if not checkpoint or checkpoint.operation != operation:
+            log_error(f"No interrupted {operation} to resume for {lab.relative_path}")
+            return None
+        
+        log_info(
+            f"Resuming {operation} from {checkpoint.updated_at[:19].replace('T', ' ')} UTC "
+            f"({len(checkpoint.completed)} completed, {len(checkpoint.errored)} failed)"
+        )
+        if checkpoint.error_message:
+            console.print(f"[dim]Last error: {checkpoint.error_message.strip().splitlines()[-1]}[/dim]")
+        
+        targets = checkpoint.retry_targets
+        if targets:
+            console.print(f"\n[bold]Retrying {len(targets)} resource(s):[/bold]")
+            for target in targets:
+                console.print(f"  • {target}")
+        else:
+            log_warning("No per-resource progress was recorded, retrying the full run")
+        
+        return checkpoint
+    
+    def cmd_destroy(
+        self,
+        lab_identifier: Optional[str] = None,
+        auto_approve: bool = False,
+        resume: bool = False
+    ) -> bool:
         lab = self._resolve_lab(lab_identifier)
         if not lab:
             return False
         
+        targets = None
+        if resume:
+            checkpoint = self._resume_checkpoint(lab, "destroy")
+            if checkpoint is None:
+                return False
+            targets = checkpoint.retry_targets
+        
         if not self.state_manager.is_deployed(lab):
+            self.terraform.clear_checkpoint(lab)
             log_warning(f"Lab not deployed: {lab.relative_path}")
             return False
         
@@ -182,7 +562,14 @@ class CommandHandler:
         log_info(f"Destroying lab: {lab.relative_path}")
         
         try:
-            success = self.terraform.destroy(lab, var_files, auto_approve=True)
+            with terraform_progress("Destroying") as on_event:
+                success = self.terraform.destroy(
+                    lab,
+                    var_files,
+                    auto_approve=True,
+                    on_event=on_event,
+                    targets=targets
+                )
             
             if success:
                 region = provider.get_region()
@@ -193,15 +580,26 @@ class CommandHandler:
                     region
                 )
                 
+                self.state_manager.record_event(lab, "destroy", True)
                 log_success("Lab destroyed successfully")
                 
                 if self.current_lab == lab:
                     self.current_lab = None
             else:
+                checkpoint = self.terraform.load_checkpoint(lab)
+                self.state_manager.record_event(
+                    lab,
+                    "destroy",
+                    False,
+                    checkpoint.error_message if checkpoint else ""
+                )
                 log_error("Destruction failed")
+                if checkpoint:
+                    log_info("Run 'destroy --resume' to retry only the remaining resources")
             
             return success
         except TerraformError as e:
+            self.state_manager.record_event(lab, "destroy", False, str(e))
             log_error(f"Destruction failed: {e}")
             return False
     
@@ -224,35 +622,102 @@ class CommandHandler:
         except TerraformError as e:
             log_error(f"Failed to retrieve outputs: {e}")
     
-    def cmd_status(self, lab_identifier: Optional[str] = None) -> None:
+    def cmd_status(
+        self,
+        lab_identifier: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> None:
         lab = self._resolve_lab(lab_identifier)
         if not lab:
             return
         
         status = self.state_manager.get_deployment_status(lab)
         metadata = self.state_manager.load_metadata(lab)
+        inventory = self.state_manager.get_inventory(lab)
         
-        resources = []
-        if self.state_manager.is_deployed(lab):
-            try:
-                resources = self.terraform.state_list(lab)
-                key_resources = [
-                    r for r in resources
-                    if any(k in r.lower() for k in [
-                        "instance", "bucket", "role", "user", 
-                        "storage", "vault", "application", "principal"
-                    ])
-                ]
-                resources = key_resources if key_resources else resources
-            except TerraformError:
-                pass
-        
-        print_status(lab, status, metadata, resources)
+        if resource_type or category:
+            resources = inventory.query(resource_type=resource_type, category=category)
+            title = f"Resources ({resource_type or category})"
+        else:
+            resources = inventory.key_resources() or inventory.query()
+            title = "Key Resources"
+        
+        print_status(lab, status, metadata, resources, title=title)
     
     def cmd_active(self) -> None:
         deployments = self.state_manager.get_active_deployments()
         print_active_deployments(deployments)
     
+    @staticmethod
+    def _parse_difficulty(value: str) -> list[int]:
+        # "5", "5-7" or "3,8"
+        ratings = set()
+        for part in value.split(","):
+            low, _, high = part.strip().partition("-")
+            start = int(low)
+            end = int(high) if high else start
+            if not 1 <= start <= end <= 10:
+                raise ValueError(value)
+            ratings.update(range(start, end + 1))
+        return sorted(ratings)
+    
+    @staticmethod
+    def _parse_since(value: str) -> datetime:
+        # "7d", "12h", "30m" or an ISO date such as 2025-01-31
+        match = re.fullmatch(r"(\d+)([dhm])", value.strip())
+        if match:
+            amount, unit = int(match.group(1)), match.group(2)
+            delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount), "m": timedelta(minutes=amount)}
+            return datetime.now(timezone.utc) - delta[unit]
+        
+        # Dates without an offset are read as UTC, like every time vault shows
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            return parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+    
+    def cmd_history(
+        self,
+        lab_identifier: Optional[str] = None,
+        since: Optional[str] = None,
+        user: Optional[str] = None,
+        limit: int = 50
+    ) -> None:
+        """Show recorded deploy/destroy/attack/drift events"""
+        lab = None
+        if lab_identifier:
+            lab = self._resolve_lab(lab_identifier)
+            if not lab:
+                return
+        
+        since_time = None
+        if since:
+            try:
+                since_time = self._parse_since(since)
+            except ValueError:
+                log_error(f"Invalid --since value: {since} (use e.g. 7d, 12h or 2025-01-31)")
+                return
+        
+        events = self.state_manager.registry.history(
+            lab_name=lab.relative_path if lab else None,
+            user=user,
+            since=since_time,
+            limit=limit
+        )
+        print_history(events)
+    
+    def cmd_stats(self, lab_identifier: Optional[str] = None) -> None:
+        """Show recorded deployment timings"""
+        lab = None
+        if lab_identifier or self.current_lab:
+            lab = self._resolve_lab(lab_identifier)
+            if not lab:
+                return
+        
+        report = self.terraform.telemetry.report(lab)
+        print_timing_report(report, lab.relative_path if lab else "all labs")
+    
     def cmd_back(self) -> None:
         if self.current_lab:
             log_info(f"Deselected lab: {self.current_lab.relative_path}")
@@ -280,8 +745,10 @@ class CommandHandler:
         table.add_column("Status", style="white")
         table.add_column("Version", style="dim")
         
+        checks = self.installer.check_installed_many([cmd for cmd, _, _ in tools])
+        
         for cmd, name, description in tools:
-            installed, version = self.installer.check_installed(cmd)
+            installed, version = checks[cmd]
             
             if installed:
                 status = "[green]✓ Installed[/green]"
@@ -296,6 +763,85 @@ class CommandHandler:
         console.print("\n[dim]Use 'install <tool>' to install missing tools[/dim]")
         console.print("[dim]Example: install aws[/dim]\n")
 
+    def cmd_prefetch(
+        self,
+        jobs: int = 4,
+        platforms: Optional[list[str]] = None,
+        mirror_dir: Optional[Path] = None
+    ) -> bool:
+        """Mirror every provider required by the labs into a local filesystem mirror"""
+        from rich.table import Table
+        
+        labs = self.discovery.discover_labs()
+        requirements = sorted(
+            collect_provider_requirements(labs, self.state_manager.hcl_index).values(),
+            key=lambda r: r.source
+        )
+        
+        if not requirements:
+            log_warning("No provider requirements found")
+            return False
+        
+        mirror = ProviderMirror(mirror_dir or DEFAULT_MIRROR_DIR)
+        platforms = platforms or [current_platform()]
+        
+        log_info(
+            f"Mirroring {len(requirements)} provider(s) for {len(labs)} lab(s) "
+            f"into {mirror.mirror_dir} ({', '.join(platforms)})"
+        )
+        
+        with console.status("[cyan]Downloading providers...[/cyan]"):
+            def on_complete(result: MirrorResult) -> None:
+                if result.success:
+                    console.print(f"[green]✓[/green] {result.requirement.source}")
+                else:
+                    console.print(f"[red]✗[/red] {result.requirement.source}: {result.message}")
+            
+            results = mirror.mirror(requirements, platforms=platforms, jobs=jobs, on_complete=on_complete)
+        
+        table = Table(show_header=True)
+        table.add_column("Provider", style="cyan")
+        table.add_column("Constraints", style="white")
+        table.add_column("Labs", justify="right", style="dim")
+        table.add_column("Status")
+        
+        for result in results:
+            requirement = result.requirement
+            table.add_row(
+                requirement.source,
+                ", ".join(sorted(requirement.constraints)) or "any",
+                str(len(requirement.labs)),
+                "[green]mirrored[/green]" if result.success else "[red]failed[/red]"
+            )
+        
+        console.print()
+        console.print(table)
+        
+        mirrored = [r.requirement for r in results if r.success]
+        if not mirrored:
+            log_error("No providers were mirrored")
+            return False
+        
+        plugin_cache = Path.home() / ".terraform.d" / "plugin-cache"
+        user_config = user_cli_config()
+        replaced_installation = mirror.write_cli_config(
+            self.terraform.cli_config_file,
+            mirrored,
+            plugin_cache_dir=plugin_cache if plugin_cache.exists() else None,
+            user_config=user_config
+        )
+        log_success(f"Terraform configured to install mirrored providers from {mirror.mirror_dir}")
+        if user_config.exists():
+            log_info(f"Settings from {user_config} were merged in; re-run prefetch after changing it")
+        if replaced_installation:
+            log_warning(f"The provider_installation block in {user_config} is replaced while the mirror is active")
+        
+        if len(mirrored) != len(results):
+            log_warning("Some providers failed to mirror and will still be downloaded on init")
+            return False
+        
+        return True
+    
     def _ensure_plugin_cache(self) -> None:
         cache_dir = Path.home() / ".terraform.d" / "plugin-cache"
         terraformrc = Path.home() / ".terraformrc"
@@ -701,8 +1247,8 @@ class CommandHandler:
             log_error("Lab not deployed. Deploy first with: deploy")
             return False
         
-        state_dir = self.state_manager.get_state_path(lab)
-        outputs = self._get_terraform_outputs(state_dir)
+        output_details = self.terraform.get_state_outputs(lab)
+        outputs = {key: output.value for key, output in output_details.items()}
         
         if not outputs:
             log_warning("No outputs available from lab")
@@ -729,9 +1275,22 @@ class CommandHandler:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 log_file = f"attack_{lab.name}_{timestamp}.json"
             
-            attack = attack_class(outputs, verbose=verbose, log_file=log_file)
+            attack = attack_class(
+                outputs,
+                verbose=verbose,
+                log_file=log_file,
+                output_details=output_details
+            )
             results = attack.run()
             
+            succeeded = sum(1 for r in results if r.success)
+            self.state_manager.record_event(
+                lab,
+                "attack",
+                succeeded == len(results),
+                f"{succeeded}/{len(results)} phases"
+            )
+            
             self._display_attack_results(results, verbose=verbose)
             
             if auto_destroy and any(r.success for r in results):
@@ -741,6 +1300,7 @@ class CommandHandler:
             return True
                 
         except Exception as e:
+            self.state_manager.record_event(lab, "attack", False, str(e))
             log_error(f"Attack failed: {str(e)}")
             import traceback
             traceback.print_exc()
@@ -790,29 +1350,6 @@ class CommandHandler:
         else:
             console.print(f"\n[bold yellow]⚠ Attack chain incomplete: {success_count}/{total} phases successful[/bold yellow]")
 
-    def _get_terraform_outputs(self, state_dir) -> dict[str, Any]:
-        """Extract outputs from terraform state"""
-        import json
-        import subprocess
-        from typing import Any
-        
-        try:
-            result = subprocess.run(
-                ['terraform', 'output', '-json'],
-                cwd=state_dir,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            outputs_raw = json.loads(result.stdout)
-            return {k: v['value'] for k, v in outputs_raw.items()}
-        except subprocess.CalledProcessError:
-            log_warning("Failed to retrieve terraform outputs")
-            return {}
-        except Exception as e:
-            log_warning(f"Error parsing outputs: {e}")
-            return {}
-        
     def complete_attack(self, text: str, line: str, begidx: int, endidx: int) -> list[str]:
         """Tab completion for attack command"""
         from vault.attacks import AttackChainLoader
@@ -884,7 +1421,12 @@ class CommandHandler:
             lab_path for lab_path, _ in self.state_manager.get_active_deployments()
         }
         
-        print_labs_table(labs, show_status=True, deployed_labs=deployed)
+        print_labs_table(
+            labs,
+            show_status=True,
+            deployed_labs=deployed,
+            lab_ids=self.discovery.lab_ids()
+        )
     
     def cmd_validate(self, lab_identifier: Optional[str] = None) -> None:
         lab = self._resolve_lab(lab_identifier)
@@ -920,7 +1462,7 @@ class CommandHandler:
         log_info(f"Initializing lab: {lab.relative_path}")
         
         try:
-            self.terraform.init(lab, var_files)
+            self.terraform.init(lab, var_files, force=True)
             log_success("Lab initialized successfully")
             log_info("Terraform providers downloaded and backend configured")
             return True
@@ -928,7 +1470,12 @@ class CommandHandler:
             log_error(f"Initialization failed: {e}")
             return False
 
-    def cmd_plan(self, lab_identifier: Optional[str] = None, destroy: bool = False) -> None:
+    def cmd_plan(
+        self,
+        lab_identifier: Optional[str] = None,
+        destroy: bool = False,
+        refresh: bool = False
+    ) -> None:
         lab = self._resolve_lab(lab_identifier)
         if not lab:
             return
@@ -949,18 +1496,37 @@ class CommandHandler:
             return
         
         try:
-            plan_output = self.terraform.plan(lab, var_files, destroy=destroy)
+            result = self.terraform.get_plan(lab, var_files, destroy=destroy, refresh=refresh)
             console.print()
-            console.print(plan_output)
+            console.print(result.output)
         except TerraformError as e:
             log_error(f"Plan failed: {e}")
+            return
+        
+        summary = (
+            f"{result.to_add} to add, {result.to_change} to change, "
+            f"{result.to_destroy} to destroy"
+        )
+        if result.cached:
+            log_info(
+                f"Cached plan from {result.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')} "
+                f"({summary}). Use --refresh to re-plan"
+            )
+        else:
+            log_info(f"Plan summary: {summary}")
             
     def _resolve_lab(self, lab_identifier: Optional[str]) -> Optional[Lab]:
         if lab_identifier:
-            if lab_identifier.isdigit():
-                lab = self.discovery.get_lab_by_index(int(lab_identifier) - 1)
-            else:
-                lab = self.discovery.get_lab_by_path(lab_identifier)
+            try:
+                if lab_identifier.isdigit():
+                    lab = self.discovery.get_lab_by_id(int(lab_identifier))
+                else:
+                    lab = self.discovery.get_lab_by_path(lab_identifier)
+            except AmbiguousLabError as e:
+                log_error(f"Ambiguous lab name '{e.name}', use one of:")
+                for candidate in e.candidates:
+                    console.print(f"  {candidate.relative_path}")
+                return None
             
             if not lab:
                 log_error(f"Lab not found: {lab_identifier}")
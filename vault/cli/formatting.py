@@ -1,12 +1,26 @@
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+)
 from rich.table import Table
 from rich.text import Text
 from rich.tree import Tree
 
+from vault.core.events import EventCallback, EventKind, TerraformEvent
+from vault.core.hcl import LabAnalysis
+from vault.core.inventory import ResourceEntry
 from vault.core.lab import CloudProvider, DeploymentStatus, Lab, LabMetadata
+from vault.core.registry import HistoryEvent
+from vault.core.telemetry import PHASES, TimingReport
 from vault.cli.banners import print_vault_banner
 
 console = Console()
@@ -18,10 +32,13 @@ print_banner = print_vault_banner
 def print_labs_table(
     labs: list[Lab],
     show_status: bool = False,
-    deployed_labs: Optional[set[str]] = None
+    deployed_labs: Optional[set[str]] = None,
+    lab_ids: Optional[dict[str, int]] = None
 ) -> None:
     if deployed_labs is None:
         deployed_labs = set()
+    if lab_ids is None:
+        lab_ids = {}
     
     tree = Tree("📚 [bold green]Available Labs[/bold green]")
     
@@ -29,6 +46,8 @@ def print_labs_table(
     provider_node = None
     
     for idx, lab in enumerate(labs, 1):
+        # Filtered listings keep each lab's catalog ID so 'use <n>' still works
+        idx = lab_ids.get(lab.relative_path, idx)
         if current_provider != lab.provider:
             current_provider = lab.provider
             provider_icon = {
@@ -64,7 +83,13 @@ def print_labs_table(
     console.print(tree)
 
 
-def print_lab_info(lab: Lab, metadata: Optional[LabMetadata] = None, status: Optional[DeploymentStatus] = None) -> None:
+def print_lab_info(
+    lab: Lab,
+    metadata: Optional[LabMetadata] = None,
+    status: Optional[DeploymentStatus] = None,
+    analysis: Optional[LabAnalysis] = None,
+    missing: Optional[dict[str, int]] = None
+) -> None:
     console.print()
     
     header_text = f"Lab: {lab.relative_path}"
@@ -88,6 +113,15 @@ def print_lab_info(lab: Lab, metadata: Optional[LabMetadata] = None, status: Opt
     if lab.estimated_time:
         info_table.add_row("Est. Time:", lab.estimated_time)
     
+    if analysis and analysis.resources:
+        # Static estimate from the .tf files; count/for_each on variables makes it a floor
+        estimate = str(analysis.expected_resources)
+        if analysis.dynamic_types:
+            estimate += "+"
+        info_table.add_row("Est. Resources:", f"{estimate} across {len(analysis.resources)} type(s)")
+        if analysis.required_variables:
+            info_table.add_row("Required Vars:", ", ".join(analysis.required_variables))
+    
     if status and metadata:
         status_color = {
             DeploymentStatus.NOT_DEPLOYED: "yellow",
@@ -104,6 +138,12 @@ def print_lab_info(lab: Lab, metadata: Optional[LabMetadata] = None, status: Opt
             info_table.add_row("Deployed by:", metadata.deployed_by)
             info_table.add_row("Deployed at:", metadata.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC"))
             info_table.add_row("Region:", metadata.region)
+        
+        if status == DeploymentStatus.PARTIAL and missing:
+            info_table.add_row(
+                "Missing:",
+                ", ".join(f"{resource_type} x{count}" for resource_type, count in sorted(missing.items()))
+            )
     
     console.print(info_table)
     
@@ -166,11 +206,65 @@ def print_active_deployments(deployments: list[tuple[str, LabMetadata]]) -> None
     console.print()
 
 
+def print_batch_results(results: list, action: str) -> None:
+    console.print(f"\n[bold cyan]{action} Summary:[/bold cyan]\n")
+    
+    table = Table(show_header=True)
+    table.add_column("Lab", style="bold")
+    table.add_column("Result", justify="center")
+    table.add_column("Time", justify="right", style="dim")
+    table.add_column("Details", overflow="fold")
+    
+    for result in results:
+        status = "[green]✓[/green]" if result.success else "[red]✗[/red]"
+        minutes, seconds = divmod(int(result.duration), 60)
+        table.add_row(
+            result.lab.relative_path,
+            status,
+            f"{minutes}:{seconds:02d}",
+            result.message
+        )
+    
+    console.print(table)
+    
+    succeeded = sum(1 for r in results if r.success)
+    if succeeded == len(results):
+        console.print(f"\n[green]✓[/green] {succeeded}/{len(results)} lab(s) succeeded\n")
+    else:
+        console.print(f"\n[red]✗[/red] {succeeded}/{len(results)} lab(s) succeeded\n")
+
+
+def print_drift_report(drift: dict[str, list[TerraformEvent]]) -> None:
+    drifted = {lab_path: events for lab_path, events in drift.items() if events}
+    if not drifted:
+        console.print("\n[green]✓[/green] No drift detected\n")
+        return
+    
+    console.print("\n[bold cyan]Drifted Resources:[/bold cyan]\n")
+    
+    table = Table(show_header=True)
+    table.add_column("Lab", style="bold")
+    table.add_column("Resource", style="white")
+    table.add_column("Change", style="yellow")
+    
+    for lab_path, events in drifted.items():
+        for idx, event in enumerate(events):
+            table.add_row(lab_path if idx == 0 else "", event.address, event.action)
+    
+    console.print(table)
+    
+    total = sum(len(events) for events in drifted.values())
+    console.print(
+        f"\n[yellow]⚠[/yellow] {total} drifted resource(s) across {len(drifted)} lab(s)\n"
+    )
+
+
 def print_status(
     lab: Lab,
     status: DeploymentStatus,
     metadata: Optional[LabMetadata],
-    resources: list[str]
+    resources: list[ResourceEntry],
+    title: str = "Key Resources"
 ) -> None:
     console.print(f"\n[bold cyan]Lab Status: [/bold cyan][bold]{lab.relative_path}[/bold]")
     console.print(f"[magenta]Provider: [/magenta]{lab.provider.value.upper()}\n")
@@ -194,11 +288,104 @@ def print_status(
         console.print(f"[cyan]Region:[/cyan] {metadata.region}")
     
     if resources:
-        console.print(f"\n[bold]Key Resources:[/bold]")
-        for resource in resources[:10]:
-            console.print(f"  • {resource}")
-        if len(resources) > 10:
-            console.print(f"  [dim]... and {len(resources) - 10} more[/dim]")
+        console.print(f"\n[bold]{title}:[/bold]")
+        
+        table = Table(show_header=True, box=None, padding=(0, 2))
+        table.add_column("Address", style="white")
+        table.add_column("Category", style="magenta")
+        table.add_column("Count", justify="right", style="cyan")
+        table.add_column("Provider", style="dim")
+        
+        for resource in resources[:20]:
+            table.add_row(
+                resource.address,
+                resource.category,
+                str(resource.instance_count),
+                resource.provider
+            )
+        
+        console.print(table)
+        if len(resources) > 20:
+            console.print(f"  [dim]... and {len(resources) - 20} more[/dim]")
+    
+    console.print()
+
+
+def print_history(events: list[HistoryEvent]) -> None:
+    if not events:
+        console.print("\n[dim]No matching history[/dim]\n")
+        return
+    
+    console.print("\n[bold cyan]Deployment History:[/bold cyan]\n")
+    
+    table = Table(show_header=True)
+    table.add_column("Time (UTC)", style="dim", no_wrap=True)
+    table.add_column("Lab", style="bold")
+    table.add_column("Action", style="cyan")
+    table.add_column("Result", justify="center")
+    table.add_column("User", style="magenta")
+    table.add_column("Details", overflow="fold")
+    
+    for event in events:
+        lines = event.details.strip().splitlines()
+        table.add_row(
+            event.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            event.lab,
+            event.action,
+            "[green]✓[/green]" if event.success else "[red]✗[/red]",
+            event.user,
+            lines[-1][:100] if lines else ""
+        )
+    
+    console.print(table)
+    console.print()
+
+
+def print_timing_report(report: TimingReport, scope: str) -> None:
+    if not report.phases and not report.resources:
+        console.print(f"\n[dim]No timing data recorded for {scope}[/dim]\n")
+        return
+    
+    console.print(f"\n[bold cyan]Timing Stats: [/bold cyan][bold]{scope}[/bold]\n")
+    
+    table = Table(show_header=True)
+    table.add_column("Phase", style="bold")
+    table.add_column("Runs", justify="right")
+    table.add_column("Failed", justify="right", style="red")
+    table.add_column("p50", justify="right", style="cyan")
+    table.add_column("p95", justify="right", style="cyan")
+    table.add_column("Max", justify="right", style="dim")
+    
+    ordered = sorted(
+        report.phases.values(),
+        key=lambda s: PHASES.index(s.name) if s.name in PHASES else len(PHASES)
+    )
+    for stats in ordered:
+        table.add_row(
+            stats.name,
+            str(stats.count),
+            str(stats.failures) if stats.failures else "",
+            f"{stats.p50:.1f}s",
+            f"{stats.p95:.1f}s",
+            f"{stats.max:.1f}s"
+        )
+    
+    console.print(table)
+    
+    slowest = report.slowest_resources()
+    if slowest:
+        console.print("\n[bold]Slowest Resource Types:[/bold]")
+        
+        table = Table(show_header=True, box=None, padding=(0, 2))
+        table.add_column("Resource Type", style="white")
+        table.add_column("Samples", justify="right", style="dim")
+        table.add_column("p50", justify="right", style="cyan")
+        table.add_column("p95", justify="right", style="cyan")
+        
+        for stats in slowest:
+            table.add_row(stats.name, str(stats.count), f"{stats.p50:.1f}s", f"{stats.p95:.1f}s")
+        
+        console.print(table)
     
     console.print()
 
@@ -230,6 +417,37 @@ def print_outputs(outputs: dict, show_sensitive: bool = False) -> None:
     console.print()
 
 
+@contextmanager
+def terraform_progress(title: str, total: Optional[int] = None) -> Iterator[EventCallback]:
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True
+    )
+    
+    with progress:
+        task_id = progress.add_task(f"[cyan]{title}[/cyan]", total=total)
+        
+        def handle(event: TerraformEvent) -> None:
+            if event.kind == EventKind.CHANGE_SUMMARY and event.operation == "plan":
+                progress.update(task_id, total=event.change_count)
+            elif event.kind in (EventKind.RESOURCE_START, EventKind.RESOURCE_PROGRESS):
+                progress.update(task_id, description=f"[cyan]{event.message}[/cyan]")
+            elif event.kind == EventKind.RESOURCE_COMPLETE:
+                progress.advance(task_id)
+                progress.console.print(f"[green]✓[/green] {event.message}")
+            elif event.is_error:
+                progress.console.print(f"[red]✗[/red] {event.message}")
+            elif event.kind == EventKind.DIAGNOSTIC and event.level == "warn":
+                progress.console.print(f"[yellow]![/yellow] {event.message}")
+        
+        yield handle
+
+
 def log_info(message: str) -> None:
     console.print(f"[blue][*][/blue] {message}")
 
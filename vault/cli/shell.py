@@ -21,7 +21,7 @@ class VaultCompleter(Completer):
         self.command_handler = command_handler
         self.commands = [
             "list", "use", "info", "init", "plan", "deploy", "destroy",
-            "outputs", "status", "active", "back", "check", "setup", "install",
+            "outputs", "status", "active", "drift", "history", "stats", "back", "check", "setup", "install", "prefetch",
             "search", "validate", "git", "clear", "help", "attack", "version", "exit", "quit"
         ]
     
@@ -42,7 +42,7 @@ class VaultCompleter(Completer):
         elif len(words) >= 1:
             cmd = words[0].lower()
             
-            if cmd in ["use", "info", "init", "plan", "deploy", "destroy", "status", "outputs", "validate"]:
+            if cmd in ["use", "info", "init", "plan", "deploy", "destroy", "status", "outputs", "validate", "stats", "history"]:
                 labs = self.command_handler.discovery.discover_labs()
                 
                 if len(words) == 1 or (len(words) == 2 and not text.endswith(" ")):
@@ -139,7 +139,11 @@ class InteractiveShell:
                 if not user_input:
                     continue
                 
-                self.process_command(user_input)
+                try:
+                    self.process_command(user_input)
+                except KeyboardInterrupt:
+                    self.command_handler.terraform.cancel_all()
+                    console.print("\n[yellow]Command interrupted[/yellow]")
                 
             except KeyboardInterrupt:
                 console.print("\n[dim]Use 'exit' to quit[/dim]")
@@ -153,45 +157,41 @@ class InteractiveShell:
         args = parts[1:]
         
         handlers = {
-            "list": lambda: self.command_handler.cmd_list(args[0] if args else None),
-            "ls": lambda: self.command_handler.cmd_list(args[0] if args else None),
+            "list": lambda: self._handle_list(args),
+            "ls": lambda: self._handle_list(args),
             "use": lambda: self.command_handler.cmd_use(args[0]) if args else log_error("Usage: use <lab>"),
             "select": lambda: self.command_handler.cmd_use(args[0]) if args else log_error("Usage: select <lab>"),
             "info": lambda: self.command_handler.cmd_info(args[0] if args else None),
             "show": lambda: self.command_handler.cmd_info(args[0] if args else None),
             "init": lambda: self.command_handler.cmd_init(args[0] if args else None),
-            "plan": lambda: self.command_handler.cmd_plan(args[0] if args else None, destroy="--destroy" in args),
-            "deploy": lambda: self.command_handler.cmd_deploy(
-                args[0] if args and not args[0].startswith('-') else None,
-                auto_approve="--auto-approve" in args or "-y" in args
-            ),
-            "run": lambda: self.command_handler.cmd_deploy(
-                args[0] if args and not args[0].startswith('-') else None,
-                auto_approve="--auto-approve" in args or "-y" in args
+            "plan": lambda: self.command_handler.cmd_plan(
+                next((arg for arg in args if not arg.startswith("-")), None),
+                destroy="--destroy" in args,
+                refresh="--refresh" in args
             ),
+            "deploy": lambda: self._handle_deploy(args),
+            "run": lambda: self._handle_deploy(args),
             "attack": lambda: self.command_handler.cmd_attack(
                 args[0] if args else None, 
                 auto_destroy="--auto-destroy" in args,
                 verbose="--verbose" in args or "-v" in args,
                 save_log="--log" in args
             ),
-            "destroy": lambda: self.command_handler.cmd_destroy(
-                args[0] if args and not args[0].startswith('-') else None,
-                auto_approve="--auto-approve" in args or "-y" in args
-            ),
-            "kill": lambda: self.command_handler.cmd_destroy(
-                args[0] if args and not args[0].startswith('-') else None,
-                auto_approve="--auto-approve" in args or "-y" in args
-            ),
+            "destroy": lambda: self._handle_destroy(args),
+            "kill": lambda: self._handle_destroy(args),
             "outputs": lambda: self._handle_outputs(args),
             "output": lambda: self._handle_outputs(args),
-            "status": lambda: self.command_handler.cmd_status(args[0] if args else None),
-            "stat": lambda: self.command_handler.cmd_status(args[0] if args else None),
+            "status": lambda: self._handle_status(args),
+            "stat": lambda: self._handle_status(args),
             "active": lambda: self.command_handler.cmd_active(),
+            "drift": lambda: self.command_handler.cmd_drift(jobs=self._parse_batch_args(args)[1]),
+            "stats": lambda: self.command_handler.cmd_stats(args[0] if args else None),
+            "history": lambda: self._handle_history(args),
             "sessions": lambda: self.command_handler.cmd_active(),
             "back": lambda: self.command_handler.cmd_back(),
             "deselect": lambda: self.command_handler.cmd_back(),
             "check": lambda: self.command_handler.cmd_check(),
+            "prefetch": lambda: self.command_handler.cmd_prefetch(),
             "setup": lambda: self.command_handler.cmd_setup(args[0] if args else None),
             "install": lambda: self.command_handler.cmd_install(args[0]) if args else log_error("Usage: install <tool>"),
             "git": lambda: self.command_handler.cmd_git(),
@@ -217,6 +217,106 @@ class InteractiveShell:
             log_error(f"Unknown command: {cmd}")
             log_warning("Type 'help' for available commands")
     
+    def _parse_batch_args(self, args: list[str]) -> tuple[list[str], int, bool]:
+        labs = []
+        jobs = 4
+        auto_approve = "--auto-approve" in args or "-y" in args
+        
+        it = iter(args)
+        for arg in it:
+            if arg in ("--jobs", "-j"):
+                value = next(it, "")
+                if value.isdigit() and int(value) > 0:
+                    jobs = int(value)
+                else:
+                    log_warning(f"Invalid job count '{value}', using {jobs}")
+            elif not arg.startswith("-"):
+                labs.append(arg)
+        
+        return labs, jobs, auto_approve
+    
+    def _handle_deploy(self, args: list[str]) -> None:
+        labs, jobs, auto_approve = self._parse_batch_args(args)
+        
+        if len(labs) > 1:
+            self.command_handler.cmd_deploy_many(labs, jobs=jobs, auto_approve=auto_approve)
+        else:
+            self.command_handler.cmd_deploy(
+                labs[0] if labs else None,
+                auto_approve=auto_approve,
+                resume="--resume" in args
+            )
+    
+    def _handle_destroy(self, args: list[str]) -> None:
+        labs, jobs, auto_approve = self._parse_batch_args(args)
+        destroy_all = "--all" in args or "-a" in args
+        
+        if len(labs) > 1 or destroy_all:
+            self.command_handler.cmd_destroy_many(
+                labs,
+                jobs=jobs,
+                auto_approve=auto_approve,
+                destroy_all=destroy_all
+            )
+        else:
+            self.command_handler.cmd_destroy(
+                labs[0] if labs else None,
+                auto_approve=auto_approve,
+                resume="--resume" in args
+            )
+    
+    def _handle_list(self, args: list[str]) -> None:
+        query = None
+        options: dict = {"providers": [], "tags": [], "resource_types": []}
+        
+        it = iter(args)
+        for arg in it:
+            if arg in ("--provider", "-p"):
+                options["providers"].append(next(it, "").lower())
+            elif arg in ("--difficulty", "-d"):
+                options["difficulty"] = next(it, None)
+            elif arg in ("--tag", "-t"):
+                options["tags"].append(next(it, ""))
+            elif arg in ("--resource", "-r"):
+                options["resource_types"].append(next(it, ""))
+            elif arg == "--match-all":
+                options["match_all"] = True
+            elif not arg.startswith("-"):
+                query = arg
+        
+        self.command_handler.cmd_list(query, **options)
+    
+    def _handle_history(self, args: list[str]) -> None:
+        lab = None
+        since = None
+        user = None
+        
+        it = iter(args)
+        for arg in it:
+            if arg == "--since":
+                since = next(it, None)
+            elif arg in ("--user", "-u"):
+                user = next(it, None)
+            elif not arg.startswith("-"):
+                lab = arg
+        
+        self.command_handler.cmd_history(lab, since=since, user=user)
+    
+    def _handle_status(self, args: list[str]) -> None:
+        lab_id = None
+        options: dict[str, str] = {}
+        
+        it = iter(args)
+        for arg in it:
+            if arg in ("--type", "-t"):
+                options["resource_type"] = next(it, "")
+            elif arg in ("--category", "-c"):
+                options["category"] = next(it, "")
+            elif not arg.startswith("-"):
+                lab_id = arg
+        
+        self.command_handler.cmd_status(lab_id, **options)
+    
     def _handle_outputs(self, args: list[str]) -> None:
         show_sensitive = "--sensitive" in args
         lab_id = next((arg for arg in args if not arg.startswith("--")), None)
@@ -225,22 +325,26 @@ class InteractiveShell:
     def _show_help(self) -> None:
         help_text = """
 [bold cyan]Core Commands[/bold cyan]
-  list [query]         List all available labs (optional search)
+  list [query]         List labs (--provider aws, --difficulty 5-7, --tag iam, --resource <type>)
   use <lab>            Select a lab to work with (path or number)
   info [lab]           Show detailed lab information
   init [lab]           Initialize lab (download providers, configure backend)
-  plan [lab]           Show terraform plan without deploying
-  deploy [lab]         Deploy the selected or specified lab
-  destroy [lab]        Destroy the selected or specified lab
+  plan [lab]           Show terraform plan without deploying (--refresh to bypass cache)
+  deploy [lab...]      Deploy the selected or specified lab(s) (--jobs N, --resume)
+  destroy [lab...]     Destroy the selected or specified lab(s) (--all, --jobs N, --resume)
   setup [provider]     Setup wizard for config files (aws/azure/gcp/all)
-  status [lab]         Show deployment status
+  status [lab]         Show deployment status (--type <type>, --category <name>)
   outputs [lab]        Show lab outputs (use --sensitive for sensitive values)
   active               List all active deployments
+  drift                Check active deployments for drift (--jobs N)
+  history [lab]        Show deploy/destroy/attack/drift history (--since 7d, --user <name>)
+  stats [lab]          Show init/plan/apply timings and slowest resource types
   version              Display VAULT version
 
 [bold cyan]Prerequisites[/bold cyan]
   check                Check which CSP CLI tools are installed
   install <tool>       Show installation instructions (aws, az, gcloud, terraform)
+  prefetch             Mirror all lab providers locally for faster/offline deploys
 
 [bold cyan]Lab Discovery[/bold cyan]
   search <query>       Search labs by name, description, or objectives
@@ -260,6 +364,7 @@ class InteractiveShell:
   use aws/iam-privesc      Select lab by path
   use 1                    Select lab by number
   plan --destroy           Show destroy plan
+  deploy aws/a aws/b -j 2  Deploy two labs concurrently
   search ssrf              Search for labs containing "ssrf"
   outputs --sensitive      Show outputs including sensitive values
 """
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from vault.core.lab import Lab
+
+
+ProgressCallback = Callable[[str], None]
+BatchOperation = Callable[[Lab, ProgressCallback], tuple[bool, str]]
+
+
+@dataclass
+class BatchResult:
+    lab: Lab
+    success: bool
+    message: str = ""
+    duration: float = 0.0
+
+
+class BatchRunner:
+    def __init__(self, jobs: int = 4):
+        self.jobs = max(1, jobs)
+    
+    def run(
+        self,
+        labs: list[Lab],
+        operation: BatchOperation,
+        on_progress: Optional[Callable[[Lab, str], None]] = None,
+        on_interrupt: Optional[Callable[[], None]] = None
+    ) -> list[BatchResult]:
+        results: dict[str, BatchResult] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {
+                executor.submit(self._run_one, lab, operation, on_progress): lab
+                for lab in labs
+            }
+            
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result.lab.relative_path] = result
+            except KeyboardInterrupt:
+                # Drop queued labs and stop running ones before the pool joins
+                for future in futures:
+                    future.cancel()
+                if on_interrupt:
+                    on_interrupt()
+                raise
+        
+        return [results[lab.relative_path] for lab in labs]
+    
+    def _run_one(
+        self,
+        lab: Lab,
+        operation: BatchOperation,
+        on_progress: Optional[Callable[[Lab, str], None]]
+    ) -> BatchResult:
+        def report(phase: str) -> None:
+            if on_progress:
+                on_progress(lab, phase)
+        
+        start = time.monotonic()
+        try:
+            success, message = operation(lab, report)
+        except Exception as e:
+            success, message = False, str(e)
+        
+        report("done" if success else "failed")
+        return BatchResult(
+            lab=lab,
+            success=success,
+            message=message,
+            duration=time.monotonic() - start
+        )
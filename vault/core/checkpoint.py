@@ -0,0 +1,54 @@
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from vault.core.events import EventCallback, EventKind, TerraformEvent
+
+
+@dataclass
+class Checkpoint:
+    operation: str
+    # Last phase that finished before the failure: "init" or "plan"
+    phase: str = ""
+    planned: list[str] = field(default_factory=list)
+    completed: list[str] = field(default_factory=list)
+    errored: list[str] = field(default_factory=list)
+    serial: int = 0
+    resource_count: int = 0
+    error_message: str = ""
+    updated_at: str = ""
+    
+    @property
+    def retry_targets(self) -> list[str]:
+        # Empty when nothing was streamed, which means a full re-run
+        done = set(self.completed)
+        pending = {address for address in self.planned if address not in done}
+        return sorted(pending | set(self.errored))
+    
+    def track(self, on_event: Optional[EventCallback] = None) -> EventCallback:
+        def record(event: TerraformEvent) -> None:
+            if event.address:
+                if event.kind == EventKind.PLANNED_CHANGE and event.address not in self.planned:
+                    self.planned.append(event.address)
+                elif event.kind == EventKind.RESOURCE_COMPLETE:
+                    self.completed.append(event.address)
+                elif event.kind == EventKind.RESOURCE_ERROR:
+                    self.errored.append(event.address)
+            if on_event:
+                on_event(event)
+        return record
+    
+    def save(self, path: Path) -> None:
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(self), indent=2))
+        tmp_path.replace(path)
+    
+    @classmethod
+    def load(cls, path: Path) -> Optional["Checkpoint"]:
+        try:
+            return cls(**json.loads(path.read_text()))
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
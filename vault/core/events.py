@@ -0,0 +1,106 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Callable, Optional
+
+
+class EventKind(str, Enum):
+    RESOURCE_START = "resource_start"
+    RESOURCE_PROGRESS = "resource_progress"
+    RESOURCE_COMPLETE = "resource_complete"
+    RESOURCE_ERROR = "resource_error"
+    RESOURCE_DRIFT = "resource_drift"
+    REFRESH = "refresh"
+    PLANNED_CHANGE = "planned_change"
+    CHANGE_SUMMARY = "change_summary"
+    DIAGNOSTIC = "diagnostic"
+    OUTPUTS = "outputs"
+    LOG = "log"
+
+
+# Terraform machine-readable UI message types (terraform <cmd> -json)
+_KIND_BY_TYPE = {
+    "apply_start": EventKind.RESOURCE_START,
+    "apply_progress": EventKind.RESOURCE_PROGRESS,
+    "apply_complete": EventKind.RESOURCE_COMPLETE,
+    "apply_errored": EventKind.RESOURCE_ERROR,
+    "resource_drift": EventKind.RESOURCE_DRIFT,
+    "refresh_start": EventKind.REFRESH,
+    "refresh_complete": EventKind.REFRESH,
+    "planned_change": EventKind.PLANNED_CHANGE,
+    "change_summary": EventKind.CHANGE_SUMMARY,
+    "diagnostic": EventKind.DIAGNOSTIC,
+    "outputs": EventKind.OUTPUTS,
+}
+
+
+@dataclass
+class TerraformEvent:
+    kind: EventKind
+    message: str
+    timestamp: datetime
+    level: str = "info"
+    address: str = ""
+    resource_type: str = ""
+    action: str = ""
+    elapsed: float = 0.0
+    operation: str = ""
+    change_count: int = 0
+    raw: bool = False
+    
+    @property
+    def is_error(self) -> bool:
+        return self.kind == EventKind.RESOURCE_ERROR or self.level == "error"
+
+
+EventCallback = Callable[[TerraformEvent], None]
+
+
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    if value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+def parse_event(line: str) -> Optional[TerraformEvent]:
+    line = line.strip()
+    if not line:
+        return None
+    
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        # Non-JSON output (e.g. provider crash text on stderr)
+        return TerraformEvent(
+            kind=EventKind.LOG,
+            message=line,
+            timestamp=datetime.now(timezone.utc),
+            raw=True
+        )
+    
+    if not isinstance(data, dict):
+        return None
+    
+    kind = _KIND_BY_TYPE.get(data.get("type", ""), EventKind.LOG)
+    hook = data.get("hook") or data.get("change") or {}
+    resource = hook.get("resource") or {}
+    changes = data.get("changes") or {}
+    
+    return TerraformEvent(
+        kind=kind,
+        message=data.get("@message", ""),
+        timestamp=_parse_timestamp(data.get("@timestamp")),
+        level=data.get("@level", "info"),
+        address=resource.get("addr", ""),
+        resource_type=resource.get("resource_type", ""),
+        action=hook.get("action", ""),
+        elapsed=float(hook.get("elapsed_seconds", 0) or 0),
+        operation=changes.get("operation", ""),
+        change_count=sum(
+            int(changes.get(key, 0) or 0) for key in ("add", "change", "remove")
+        )
+    )
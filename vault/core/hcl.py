@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+HCL_INDEX_FORMAT = 1
+
+_BLOCK_HEADER = re.compile(r'^(resource|module|variable|terraform)((?:[ \t]+"[^"]*")*)[ \t]*\{', re.MULTILINE)
+_LABEL = re.compile(r'"([^"]*)"')
+_HEREDOC = re.compile(r'<<-?(\w+)\n.*?^\s*\1\s*$', re.MULTILINE | re.DOTALL)
+_COMMENT = re.compile(r'^\s*(#|//).*$', re.MULTILINE)
+_LITERAL_COUNT = re.compile(r'^\s*count\s*=\s*(\d+)\s*$', re.MULTILINE)
+_DYNAMIC_COUNT = re.compile(r'^\s*(count|for_each)\s*=', re.MULTILINE)
+_SOURCE_ATTR = re.compile(r'source\s*=\s*"([^"]+)"')
+_VERSION_ATTR = re.compile(r'version\s*=\s*"([^"]+)"')
+_DEFAULT_ATTR = re.compile(r'^\s*default\s*=', re.MULTILINE)
+_PROVIDER_ENTRY = re.compile(r'([\w-]+)\s*=\s*(?:\{([^{}]*)\}|"([^"]*)")')
+
+
+@dataclass
+class FileAnalysis:
+    # resource type -> instances, with a literal count expanded
+    resources: dict[str, int] = field(default_factory=dict)
+    dynamic_types: list[str] = field(default_factory=list)
+    # module name -> [source, dynamic]
+    modules: dict[str, list] = field(default_factory=dict)
+    # provider source -> version constraints
+    providers: dict[str, list[str]] = field(default_factory=dict)
+    # variable name -> has a default
+    variables: dict[str, bool] = field(default_factory=dict)
+
+
+@dataclass
+class LabAnalysis:
+    resources: dict[str, int] = field(default_factory=dict)
+    dynamic_types: set[str] = field(default_factory=set)
+    modules: list[str] = field(default_factory=list)
+    providers: dict[str, set[str]] = field(default_factory=dict)
+    variables: dict[str, bool] = field(default_factory=dict)
+    config_dirs: list[Path] = field(default_factory=list)
+    
+    @property
+    def resource_types(self) -> list[str]:
+        return sorted(self.resources)
+    
+    @property
+    def expected_resources(self) -> int:
+        # A lower bound when count/for_each depends on variables
+        return sum(self.resources.values())
+    
+    @property
+    def required_variables(self) -> list[str]:
+        return sorted(name for name, has_default in self.variables.items() if not has_default)
+    
+    def missing_resources(self, deployed: dict[str, int]) -> dict[str, int]:
+        # Only types with a statically known count can be judged missing
+        return {
+            resource_type: expected - deployed.get(resource_type, 0)
+            for resource_type, expected in self.resources.items()
+            if resource_type not in self.dynamic_types
+            and deployed.get(resource_type, 0) < expected
+        }
+
+
+def _block_body(content: str, start: int) -> tuple[str, int]:
+    # start points at the opening brace; quoted strings may hold braces
+    depth = 0
+    in_string = False
+    i = start
+    while i < len(content):
+        char = content[i]
+        if in_string:
+            if char == "\\":
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return content[start + 1:i], i + 1
+        i += 1
+    return content[start + 1:], len(content)
+
+
+def remove_blocks(content: str, keyword: str) -> str:
+    # Strips every top-level '<keyword> { ... }' block, e.g. from a CLI config
+    kept = []
+    pos = 0
+    for match in re.finditer(rf'^[ \t]*{keyword}[ \t]*\{{', content, re.MULTILINE):
+        if match.start() < pos:
+            continue
+        kept.append(content[pos:match.start()])
+        _, pos = _block_body(content, match.end() - 1)
+    kept.append(content[pos:])
+    return "".join(kept)
+
+
+def _top_level(body: str) -> str:
+    # Drops nested blocks so count/source inside e.g. a dynamic block are ignored
+    kept = []
+    depth = 0
+    for char in body:
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif depth == 0:
+            kept.append(char)
+    return "".join(kept)
+
+
+def _parse_required_providers(body: str, providers: dict[str, list[str]]) -> None:
+    for match in re.finditer(r'\brequired_providers\s*\{', body):
+        block, _ = _block_body(body, match.end() - 1)
+        for name, attrs, shorthand in _PROVIDER_ENTRY.findall(block):
+            if attrs:
+                source_match = _SOURCE_ATTR.search(attrs)
+                version_match = _VERSION_ATTR.search(attrs)
+                source = source_match.group(1) if source_match else f"hashicorp/{name}"
+                version = version_match.group(1) if version_match else ""
+            else:
+                # Legacy shorthand: aws = "~> 3.0"
+                source, version = f"hashicorp/{name}", shorthand
+            
+            constraints = providers.setdefault(source.lower(), [])
+            if version and version not in constraints:
+                constraints.append(version)
+
+
+def analyze_hcl(content: str) -> FileAnalysis:
+    analysis = FileAnalysis()
+    # Heredoc bodies (user_data scripts, policies) can hold unbalanced quotes
+    content = _COMMENT.sub("", _HEREDOC.sub('""', content))
+    
+    pos = 0
+    while True:
+        match = _BLOCK_HEADER.search(content, pos)
+        if not match:
+            break
+        
+        body, pos = _block_body(content, match.end() - 1)
+        kind, labels = match.group(1), _LABEL.findall(match.group(2))
+        attrs = _top_level(body)
+        
+        if kind == "resource" and labels:
+            resource_type = labels[0]
+            count_match = _LITERAL_COUNT.search(attrs)
+            if count_match:
+                instances = int(count_match.group(1))
+            else:
+                instances = 1
+                if _DYNAMIC_COUNT.search(attrs) and resource_type not in analysis.dynamic_types:
+                    analysis.dynamic_types.append(resource_type)
+            analysis.resources[resource_type] = analysis.resources.get(resource_type, 0) + instances
+        elif kind == "module" and labels:
+            source_match = _SOURCE_ATTR.search(attrs)
+            analysis.modules[labels[0]] = [
+                source_match.group(1) if source_match else "",
+                bool(_DYNAMIC_COUNT.search(attrs))
+            ]
+        elif kind == "variable" and labels:
+            analysis.variables[labels[0]] = bool(_DEFAULT_ATTR.search(attrs))
+        elif kind == "terraform":
+            _parse_required_providers(body, analysis.providers)
+    
+    return analysis
+
+
+class HCLIndex:
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file = cache_file
+        self._files: Optional[dict[str, dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def _load(self) -> dict[str, dict]:
+        if self._files is None:
+            self._files = {}
+            if self.cache_file:
+                try:
+                    data = json.loads(self.cache_file.read_text())
+                    if data.get("format") == HCL_INDEX_FORMAT:
+                        self._files = data.get("files", {})
+                except (OSError, json.JSONDecodeError):
+                    pass
+        return self._files
+    
+    def _save(self) -> None:
+        if not self.cache_file or not self._dirty:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps({"format": HCL_INDEX_FORMAT, "files": self._files}))
+            tmp_file.replace(self.cache_file)
+            self._dirty = False
+        except OSError:
+            pass
+    
+    def analyze_file(self, tf_file: Path) -> FileAnalysis:
+        # Keyed by content hash, so renames, checkouts and touch are free
+        try:
+            raw = tf_file.read_bytes()
+        except OSError:
+            return FileAnalysis()
+        
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            files = self._load()
+            if digest in files:
+                return FileAnalysis(**files[digest])
+        
+        analysis = analyze_hcl(raw.decode(errors="replace"))
+        with self._lock:
+            files[digest] = asdict(analysis)
+            self._dirty = True
+        return analysis
+    
+    def _analyze_dir(self, directory: Path, result: LabAnalysis, stack: tuple[Path, ...], dynamic: bool) -> None:
+        if directory in stack or not directory.is_dir():
+            return
+        if directory not in result.config_dirs:
+            result.config_dirs.append(directory)
+        
+        for tf_file in sorted(directory.glob("*.tf")):
+            analysis = self.analyze_file(tf_file)
+            
+            for resource_type, instances in analysis.resources.items():
+                result.resources[resource_type] = result.resources.get(resource_type, 0) + instances
+                if dynamic:
+                    result.dynamic_types.add(resource_type)
+            result.dynamic_types.update(analysis.dynamic_types)
+            
+            for source, constraints in analysis.providers.items():
+                result.providers.setdefault(source, set()).update(constraints)
+            
+            if not stack:
+                # Module inputs are not lab variables
+                result.variables.update(analysis.variables)
+            
+            for source, module_dynamic in analysis.modules.values():
+                if source not in result.modules:
+                    result.modules.append(source)
+                # Only local modules (e.g. ../modules/lab-vpc) can be analysed
+                if source.startswith(("./", "../")):
+                    self._analyze_dir(
+                        (directory / source).resolve(),
+                        result,
+                        stack + (directory,),
+                        dynamic or module_dynamic
+                    )
+    
+    def analyze(self, terraform_dir: Path) -> LabAnalysis:
+        result = LabAnalysis()
+        self._analyze_dir(terraform_dir.resolve(), result, (), False)
+        with self._lock:
+            self._save()
+        return result
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from vault.core.tfstate import resource_address
+
+
+# Checked in order; the first category with a matching pattern wins
+RESOURCE_CATEGORIES: dict[str, tuple[str, ...]] = {
+    "storage": ("bucket", "storage", "ebs_", "disk", "snapshot", "s3_"),
+    "identity": (
+        "iam_", "role", "user", "principal", "service_account", "policy",
+        "identity", "application",
+    ),
+    "secrets": ("secret", "key_vault", "kms_", "ssm_parameter"),
+    "database": ("db_", "rds_", "dynamodb", "sql", "cosmosdb"),
+    "compute": (
+        "instance", "virtual_machine", "lambda_function", "ecs_", "container",
+        "launch_template", "cloud_run", "function_app",
+    ),
+    "network": (
+        "vpc", "subnet", "security_group", "network", "route", "gateway",
+        "firewall", "eip", "public_ip", "lb", "dns",
+    ),
+}
+
+KEY_CATEGORIES = ("compute", "storage", "identity", "secrets", "database")
+
+
+def categorize(resource_type: str) -> str:
+    # Strip the provider prefix so "aws_iam_role" matches on "iam_role"
+    _, _, name = resource_type.partition("_")
+    for category, patterns in RESOURCE_CATEGORIES.items():
+        if any(pattern in name for pattern in patterns):
+            return category
+    return "other"
+
+
+def _provider_name(provider: str) -> str:
+    # provider["registry.terraform.io/hashicorp/aws"] -> hashicorp/aws
+    if '"' in provider:
+        provider = provider.split('"')[1]
+    return provider.removeprefix("registry.terraform.io/")
+
+
+@dataclass
+class ResourceEntry:
+    address: str
+    type: str
+    name: str
+    module: str
+    mode: str
+    provider: str
+    instance_count: int
+    category: str
+
+
+class ResourceInventory:
+    def __init__(self, entries: list[ResourceEntry]):
+        self.entries = entries
+        self.by_type: dict[str, list[ResourceEntry]] = {}
+        self.by_category: dict[str, list[ResourceEntry]] = {}
+        
+        for entry in entries:
+            self.by_type.setdefault(entry.type, []).append(entry)
+            self.by_category.setdefault(entry.category, []).append(entry)
+    
+    @classmethod
+    def from_resources(cls, resources: list[dict[str, Any]]) -> "ResourceInventory":
+        entries = []
+        for resource in resources:
+            resource_type = resource.get("type", "")
+            entries.append(
+                ResourceEntry(
+                    address=resource_address(resource),
+                    type=resource_type,
+                    name=resource.get("name", ""),
+                    module=resource.get("module", ""),
+                    mode=resource.get("mode", "managed"),
+                    provider=_provider_name(resource.get("provider", "")),
+                    instance_count=len(resource.get("instances", [])),
+                    category=categorize(resource_type)
+                )
+            )
+        return cls(entries)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def query(
+        self,
+        resource_type: Optional[str] = None,
+        category: Optional[str] = None,
+        include_data: bool = False
+    ) -> list[ResourceEntry]:
+        if resource_type is not None:
+            entries = self.by_type.get(resource_type, [])
+        elif category is not None:
+            entries = self.by_category.get(category, [])
+        else:
+            entries = self.entries
+        
+        if category is not None and resource_type is not None:
+            entries = [e for e in entries if e.category == category]
+        
+        if not include_data:
+            entries = [e for e in entries if e.mode == "managed"]
+        
+        return entries
+    
+    def key_resources(self) -> list[ResourceEntry]:
+        return [
+            entry
+            for category in KEY_CATEGORIES
+            for entry in self.query(category=category)
+        ]
+    
+    def type_counts(self) -> dict[str, int]:
+        return {
+            resource_type: sum(e.instance_count for e in entries)
+            for resource_type, entries in self.by_type.items()
+        }
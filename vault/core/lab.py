@@ -1,5 +1,6 @@
+import re
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Optional
@@ -92,6 +93,7 @@ class Lab:
     description: str = ""
     estimated_time: str = ""
     learning_objectives: list[str] = field(default_factory=list)
+    resource_types: list[str] = field(default_factory=list)
     
     @property
     def relative_path(self) -> str:
@@ -121,7 +123,7 @@ class LabSearchResult:
 
 
 class TerraformOutput(BaseModel):
-    value: str | dict | list
+    value: str | int | float | bool | dict | list | None
     sensitive: bool = False
     type: str | list = ""
 
@@ -131,4 +133,34 @@ class DeploymentResult(BaseModel):
     lab_name: str
     outputs: dict[str, TerraformOutput] = Field(default_factory=dict)
     error_message: Optional[str] = None
-    resources_created: int = 0
\ No newline at end of file
+    resources_created: int = 0
+
+
+class PlanResult(BaseModel):
+    output: str
+    to_add: int = 0
+    to_change: int = 0
+    to_destroy: int = 0
+    cached: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    @property
+    def total_changes(self) -> int:
+        return self.to_add + self.to_change + self.to_destroy
+    
+    @classmethod
+    def from_output(cls, output: str) -> "PlanResult":
+        match = re.search(
+            r"Plan: (\d+) to add, (\d+) to change, (\d+) to destroy",
+            output
+        )
+        if not match:
+            return cls(output=output)
+        
+        to_add, to_change, to_destroy = (int(n) for n in match.groups())
+        return cls(
+            output=output,
+            to_add=to_add,
+            to_change=to_change,
+            to_destroy=to_destroy
+        )
\ No newline at end of file
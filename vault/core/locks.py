@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: locking degrades to in-process only
+    fcntl = None
+
+
+class LockTimeout(Exception):
+    pass
+
+
+class FileLock:
+    def __init__(self, path: Path, poll_interval: float = 0.1):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self._thread_lock = threading.Lock()
+    
+    def _holder(self) -> str:
+        try:
+            info = json.loads(self.path.read_text() or "{}")
+        except (OSError, json.JSONDecodeError):
+            return ""
+        if not info:
+            return ""
+        return f" (held by pid {info.get('pid')}: {info.get('command', '')})"
+    
+    def _try_lock(self, fd: int) -> bool:
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+    
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        me = threading.get_ident()
+        if self._owner == me:
+            # Re-entrant for the owning thread, e.g. apply() calling init()
+            self._depth += 1
+            return
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        if not self._thread_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise LockTimeout(f"Timed out waiting for {self.path.name}")
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            while not self._try_lock(fd):
+                if deadline is not None and time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out waiting for {self.path.name}{self._holder()}")
+                time.sleep(self.poll_interval)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        
+        os.ftruncate(fd, 0)
+        os.write(fd, json.dumps({"pid": os.getpid(), "command": " ".join(sys.argv[1:3])}).encode())
+        
+        self._fd = fd
+        self._owner = me
+        self._depth = 1
+    
+    def release(self) -> None:
+        if self._owner != threading.get_ident():
+            return
+        
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        
+        fd, self._fd, self._owner = self._fd, None, None
+        assert fd is not None
+        try:
+            os.ftruncate(fd, 0)
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+    
+    @contextmanager
+    def hold(self, timeout: Optional[float] = None) -> Iterator[None]:
+        self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class LockManager:
+    REGISTRY_KEY = "registry"
+    
+    def __init__(self, lock_dir: Path):
+        self.lock_dir = lock_dir
+        self._locks: dict[str, FileLock] = {}
+        self._lock = threading.Lock()
+    
+    def _get(self, name: str) -> FileLock:
+        with self._lock:
+            if name not in self._locks:
+                self._locks[name] = FileLock(self.lock_dir / f"{name}.lock")
+            return self._locks[name]
+    
+    def state_lock(self, state_key: str) -> FileLock:
+        return self._get(f"state-{state_key}")
+    
+    def registry_lock(self) -> FileLock:
+        return self._get(self.REGISTRY_KEY)
+
+
+_managers: dict[Path, LockManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_lock_manager(state_dir: Path) -> LockManager:
+    # One manager per state dir so every FileLock for a path is shared
+    # in-process; flock() would otherwise block against our own other fd
+    lock_dir = (state_dir / ".locks").resolve()
+    with _managers_lock:
+        if lock_dir not in _managers:
+            _managers[lock_dir] = LockManager(lock_dir)
+        return _managers[lock_dir]
@@ -0,0 +1,214 @@
+import os
+import platform
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from vault.core.hcl import HCLIndex, remove_blocks
+from vault.core.lab import Lab
+
+
+DEFAULT_MIRROR_DIR = Path.home() / ".terraform.d" / "vault-mirror"
+DEFAULT_REGISTRY = "registry.terraform.io"
+
+_LOCKED_PROVIDER = re.compile(r'provider\s+"([^"]+)"\s*\{[^}]*?\bversion\s*=\s*"([^"]+)"')
+_PLUGIN_CACHE_ATTR = re.compile(r'^\s*plugin_cache_dir\s*=', re.MULTILINE)
+
+
+@dataclass
+class ProviderRequirement:
+    source: str
+    constraints: set[str] = field(default_factory=set)
+    labs: set[str] = field(default_factory=set)
+    
+    @property
+    def address(self) -> str:
+        # hashicorp/aws -> registry.terraform.io/hashicorp/aws
+        if self.source.count("/") == 1:
+            return f"{DEFAULT_REGISTRY}/{self.source}"
+        return self.source
+    
+    @property
+    def local_name(self) -> str:
+        return self.source.rsplit("/", 1)[-1]
+
+
+@dataclass
+class MirrorResult:
+    requirement: ProviderRequirement
+    success: bool
+    message: str = ""
+
+
+def current_platform() -> str:
+    system = platform.system().lower()
+    machine = platform.machine().lower()
+    arch = {"x86_64": "amd64", "amd64": "amd64", "aarch64": "arm64", "arm64": "arm64"}.get(
+        machine, machine
+    )
+    return f"{system}_{arch}"
+
+
+def _locked_versions(lab: Lab) -> dict[str, str]:
+    lockfile = lab.terraform_dir / ".terraform.lock.hcl"
+    try:
+        content = lockfile.read_text()
+    except OSError:
+        return {}
+    
+    # registry.terraform.io/hashicorp/aws -> hashicorp/aws
+    return {
+        address.lower().removeprefix(f"{DEFAULT_REGISTRY}/"): version
+        for address, version in _LOCKED_PROVIDER.findall(content)
+    }
+
+
+def user_cli_config() -> Path:
+    # Where terraform would read its CLI config from without vault's override
+    env_config = os.environ.get("TF_CLI_CONFIG_FILE")
+    if env_config:
+        return Path(env_config)
+    if platform.system() == "Windows":
+        return Path(os.environ.get("APPDATA", "")) / "terraform.rc"
+    return Path.home() / ".terraformrc"
+
+
+def collect_provider_requirements(
+    labs: list[Lab],
+    hcl_index: Optional[HCLIndex] = None
+) -> dict[str, ProviderRequirement]:
+    hcl_index = hcl_index or HCLIndex()
+    requirements: dict[str, ProviderRequirement] = {}
+    
+    # Includes providers required by local modules, e.g. ../modules/lab-vpc
+    for lab in labs:
+        for source, constraints in hcl_index.analyze(lab.terraform_dir).providers.items():
+            requirement = requirements.setdefault(source, ProviderRequirement(source=source))
+            requirement.labs.add(lab.relative_path)
+            requirement.constraints.update(constraints)
+        
+        # init refuses to pick another version than an existing lockfile pins,
+        # so the locked version is mirrored as well
+        for source, version in _locked_versions(lab).items():
+            requirement = requirements.setdefault(source, ProviderRequirement(source=source))
+            requirement.labs.add(lab.relative_path)
+            requirement.constraints.add(f"= {version}")
+    
+    return requirements
+
+
+class ProviderMirror:
+    def __init__(self, mirror_dir: Path = DEFAULT_MIRROR_DIR):
+        self.mirror_dir = mirror_dir
+    
+    def _mirror_one(
+        self,
+        requirement: ProviderRequirement,
+        platforms: list[str]
+    ) -> MirrorResult:
+        # Mirror from the public registry even if vault's CLI config points at this mirror
+        env = {k: v for k, v in os.environ.items() if k != "TF_CLI_CONFIG_FILE"}
+        platform_args = [f"-platform={p}" for p in platforms]
+        
+        # Constraints from different labs may not be satisfiable together,
+        # so each one gets its own mirror run
+        for constraint in sorted(requirement.constraints) or [""]:
+            with tempfile.TemporaryDirectory(prefix="vault-prefetch-") as work_dir:
+                version_line = f'      version = "{constraint}"\n' if constraint else ""
+                Path(work_dir, "versions.tf").write_text(
+                    "terraform {\n"
+                    "  required_providers {\n"
+                    f"    {requirement.local_name} = {{\n"
+                    f'      source  = "{requirement.source}"\n'
+                    f"{version_line}"
+                    "    }\n"
+                    "  }\n"
+                    "}\n"
+                )
+                
+                result = subprocess.run(
+                    ["terraform", "providers", "mirror", *platform_args, str(self.mirror_dir)],
+                    cwd=work_dir,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=False
+                )
+                if result.returncode != 0:
+                    error = (result.stderr or result.stdout).strip().splitlines()
+                    return MirrorResult(
+                        requirement=requirement,
+                        success=False,
+                        message=error[-1] if error else f"exit code {result.returncode}"
+                    )
+        
+        return MirrorResult(requirement=requirement, success=True)
+    
+    def mirror(
+        self,
+        requirements: list[ProviderRequirement],
+        platforms: Optional[list[str]] = None,
+        jobs: int = 4,
+        on_complete: Optional[Callable[[MirrorResult], None]] = None
+    ) -> list[MirrorResult]:
+        platforms = platforms or [current_platform()]
+        self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        
+        def run(requirement: ProviderRequirement) -> MirrorResult:
+            result = self._mirror_one(requirement, platforms)
+            if on_complete:
+                on_complete(result)
+            return result
+        
+        # One job per provider source keeps concurrent writes to the same
+        # mirror directory apart
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            return list(executor.map(run, requirements))
+    
+    def write_cli_config(
+        self,
+        config_file: Path,
+        providers: list[ProviderRequirement],
+        plugin_cache_dir: Optional[Path] = None,
+        user_config: Optional[Path] = None
+    ) -> bool:
+        includes = ", ".join(f'"{p.address}"' for p in sorted(providers, key=lambda p: p.address))
+        
+        # TF_CLI_CONFIG_FILE replaces the user's config rather than adding to it,
+        # so credentials, plugin_cache_dir etc. are carried over. Only one
+        # provider_installation block may exist, so the user's is replaced.
+        user_settings = ""
+        if user_config and user_config.resolve() != config_file.resolve():
+            try:
+                user_settings = user_config.read_text()
+            except OSError:
+                pass
+        merged = remove_blocks(user_settings, "provider_installation")
+        replaced_installation = merged != user_settings
+        
+        lines = ["# Generated by vault prefetch"]
+        if merged.strip():
+            lines.extend([f"# Settings copied from {user_config}", merged.strip()])
+        if plugin_cache_dir and not _PLUGIN_CACHE_ATTR.search(merged):
+            lines.append(f'plugin_cache_dir = "{plugin_cache_dir}"')
+        lines.extend([
+            "",
+            "provider_installation {",
+            "  filesystem_mirror {",
+            f'    path    = "{self.mirror_dir}"',
+            f"    include = [{includes}]",
+            "  }",
+            "",
+            "  direct {",
+            f"    exclude = [{includes}]",
+            "  }",
+            "}",
+        ])
+        
+        config_file.parent.mkdir(parents=True, exist_ok=True)
+        config_file.write_text("\n".join(lines) + "\n")
+        return replaced_installation
@@ -0,0 +1,171 @@
+import os
+import signal
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+class ProcessAborted(Exception):
+    def __init__(self, message: str, forced: bool = False):
+        super().__init__(message)
+        self.forced = forced
+
+
+class ProcessTimeout(ProcessAborted):
+    pass
+
+
+class ProcessInterrupted(ProcessAborted):
+    pass
+
+
+class ManagedProcess:
+    def __init__(
+        self,
+        cmd: list[str],
+        cwd: Path,
+        env: Optional[dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        interrupt_grace: float = 30.0,
+        terminate_grace: float = 10.0
+    ):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.interrupt_grace = interrupt_grace
+        self.terminate_grace = terminate_grace
+        
+        self.process: Optional[subprocess.Popen[str]] = None
+        self.timed_out = False
+        self.cancelled = False
+        self.interrupted = False
+        self.forced = False
+        
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._timer: Optional[threading.Timer] = None
+    
+    def _start(self, **popen_args: Any) -> subprocess.Popen[str]:
+        # A session of its own keeps the terminal's Ctrl+C away from the child, so
+        # vault forwards exactly one SIGINT; a second one makes terraform exit
+        # without writing state
+        self.process = subprocess.Popen(
+            self.cmd,
+            cwd=self.cwd,
+            env=self.env,
+            text=True,
+            start_new_session=os.name != "nt",
+            **popen_args
+        )
+        
+        if self.timeout:
+            self._timer = threading.Timer(self.timeout, self._on_timeout)
+            self._timer.daemon = True
+            self._timer.start()
+        
+        return self.process
+    
+    def _on_timeout(self) -> None:
+        self.timed_out = True
+        self._stop()
+    
+    def cancel(self) -> None:
+        # Safe to call from any thread, e.g. while a batch is being torn down
+        self.cancelled = True
+        if self.process is not None:
+            self._stop()
+    
+    def kill(self) -> None:
+        self.cancelled = True
+        self.forced = True
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+    
+    def _stop(self) -> None:
+        with self._lock:
+            if self._stopping or self.process is None or self.process.poll() is not None:
+                return
+            self._stopping = True
+        
+        process = self.process
+        try:
+            # Terraform treats the first SIGINT as a graceful stop that still
+            # writes state; a second one makes it exit immediately
+            process.send_signal(signal.SIGINT)
+            try:
+                process.wait(self.interrupt_grace)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            
+            self.forced = True
+            process.terminate()
+            try:
+                process.wait(self.terminate_grace)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            
+            process.kill()
+            process.wait()
+        except KeyboardInterrupt:
+            # A second Ctrl+C skips the grace periods
+            self.forced = True
+            process.kill()
+            process.wait()
+        except ProcessLookupError:
+            pass
+    
+    def _finish(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+        
+        command = " ".join(self.cmd[:2])
+        if self.timed_out:
+            raise ProcessTimeout(f"{command} timed out after {self.timeout:.0f}s", self.forced)
+        if self.interrupted or self.cancelled:
+            raise ProcessInterrupted(f"{command} was interrupted", self.forced)
+    
+    def _drain_in_background(self, drain: Callable[[], object]) -> None:
+        # Keep reading while the child shuts down so it never blocks on a full pipe
+        threading.Thread(target=drain, daemon=True).start()
+    
+    def run(self, capture_output: bool = False) -> subprocess.CompletedProcess[str]:
+        pipe = subprocess.PIPE if capture_output else None
+        process = self._start(stdout=pipe, stderr=pipe)
+        
+        stdout, stderr = None, None
+        try:
+            stdout, stderr = process.communicate()
+        except KeyboardInterrupt:
+            self.interrupted = True
+            if capture_output:
+                self._drain_in_background(process.communicate)
+            self._stop()
+        finally:
+            self._finish()
+        
+        return subprocess.CompletedProcess(self.cmd, process.returncode, stdout, stderr)
+    
+    def stream(self, on_line: Callable[[str], None]) -> int:
+        process = self._start(stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1)
+        assert process.stdout is not None
+        
+        try:
+            for line in process.stdout:
+                on_line(line)
+            process.stdout.close()
+            process.wait()
+        except KeyboardInterrupt:
+            self.interrupted = True
+            self._drain_in_background(process.stdout.read)
+            self._stop()
+        finally:
+            self._finish()
+        
+        return process.returncode
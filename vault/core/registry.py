@@ -0,0 +1,219 @@
+import sqlite3
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from vault.core.lab import CloudProvider, DeploymentStatus, LabMetadata
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    lab TEXT PRIMARY KEY,
+    csp TEXT NOT NULL,
+    status TEXT NOT NULL,
+    resource_count INTEGER NOT NULL DEFAULT 0,
+    region TEXT NOT NULL DEFAULT '',
+    deployed_by TEXT NOT NULL DEFAULT '',
+    last_action TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deployments_active
+    ON deployments (resource_count, updated_at);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lab TEXT NOT NULL,
+    action TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    user TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    details TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_events_lab ON events (lab, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_user ON events (user, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+"""
+
+_COLUMNS = "lab, csp, last_action, updated_at, deployed_by, region, resource_count"
+
+
+def _to_db(value: datetime) -> str:
+    # Naive datetimes are taken as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _from_db(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+@dataclass
+class HistoryEvent:
+    lab: str
+    action: str
+    success: bool
+    user: str
+    timestamp: datetime
+    details: str = ""
+
+
+class DeploymentRegistry:
+    DB_FILE = "registry.db"
+    
+    def __init__(self, state_dir: Path):
+        self.db_path = state_dir / self.DB_FILE
+        state_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per call keeps the registry usable from batch worker threads
+        with closing(sqlite3.connect(self.db_path, timeout=10.0)) as conn:
+            with conn:
+                yield conn
+    
+    @staticmethod
+    def _to_metadata(row: tuple) -> LabMetadata:
+        lab, csp, last_action, updated_at, deployed_by, region, resource_count = row
+        return LabMetadata(
+            lab_name=lab,
+            csp=csp,
+            last_action=last_action,
+            timestamp=_from_db(updated_at),
+            deployed_by=deployed_by,
+            region=region,
+            resources_count=resource_count
+        )
+    
+    def is_empty(self) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM deployments LIMIT 1").fetchone() is None
+    
+    def record_action(self, metadata: LabMetadata, status: DeploymentStatus) -> None:
+        timestamp = _to_db(metadata.timestamp)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO deployments
+                    (lab, csp, status, resource_count, region, deployed_by, last_action,
+                     created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (lab) DO UPDATE SET
+                    csp = excluded.csp,
+                    status = excluded.status,
+                    resource_count = excluded.resource_count,
+                    region = excluded.region,
+                    deployed_by = excluded.deployed_by,
+                    last_action = excluded.last_action,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    metadata.lab_name,
+                    CloudProvider(metadata.csp).value,
+                    status.value,
+                    metadata.resources_count,
+                    metadata.region,
+                    metadata.deployed_by,
+                    metadata.last_action,
+                    timestamp,
+                    timestamp
+                )
+            )
+    
+    def record_state(
+        self,
+        lab_name: str,
+        csp: str,
+        status: DeploymentStatus,
+        resource_count: int
+    ) -> None:
+        # Status and counts only; who/where stay as the last save_metadata wrote them
+        timestamp = _to_db(datetime.now(timezone.utc))
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO deployments (lab, csp, status, resource_count, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (lab) DO UPDATE SET
+                    status = excluded.status,
+                    resource_count = excluded.resource_count,
+                    updated_at = excluded.updated_at
+                """,
+                (lab_name, csp, status.value, resource_count, timestamp, timestamp)
+            )
+    
+    def get(self, lab_name: str) -> Optional[LabMetadata]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM deployments WHERE lab = ?",
+                (lab_name,)
+            ).fetchone()
+        return self._to_metadata(row) if row else None
+    
+    def active(self) -> list[LabMetadata]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM deployments "
+                "WHERE resource_count > 0 ORDER BY updated_at DESC"
+            ).fetchall()
+        return [self._to_metadata(row) for row in rows]
+    
+    def record_event(
+        self,
+        lab_name: str,
+        action: str,
+        success: bool,
+        user: str,
+        details: str = ""
+    ) -> None:
+        # Events are only ever appended
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO events (lab, action, success, user, timestamp, details) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (lab_name, action, int(success), user, _to_db(datetime.now(timezone.utc)), details)
+            )
+    
+    def history(
+        self,
+        lab_name: Optional[str] = None,
+        user: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 50
+    ) -> list[HistoryEvent]:
+        clauses, params = [], []
+        if lab_name:
+            clauses.append("lab = ?")
+            params.append(lab_name)
+        if user:
+            clauses.append("user = ?")
+            params.append(user)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(_to_db(since))
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT lab, action, success, user, timestamp, details FROM events "
+                f"{where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        
+        return [
+            HistoryEvent(
+                lab=lab,
+                action=action,
+                success=bool(success),
+                user=user,
+                timestamp=_from_db(timestamp),
+                details=details
+            )
+            for lab, action, success, user, timestamp, details in rows
+        ]
\ No newline at end of file
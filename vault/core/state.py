@@ -1,16 +1,33 @@
 import json
-from datetime import datetime
+import os
+import shutil
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from vault.core.hcl import HCLIndex, LabAnalysis
+from vault.core.inventory import ResourceInventory
 from vault.core.lab import CloudProvider, DeploymentStatus, Lab, LabMetadata
+from vault.core.locks import LockTimeout, get_lock_manager
+from vault.core.registry import DeploymentRegistry
+from vault.core.tfstate import TFSTATE_CACHE, TFStateError, summary_path
 
 
 class StateManager:
+    DATA_DIR = ".terraform"
+    HCL_INDEX_FILE = "hcl-index.json"
+    REGISTRY_LOCK_TIMEOUT = 10.0
+    
     def __init__(self, state_dir: Path):
         self.state_dir = state_dir
         self.metadata_dir = state_dir / ".metadata"
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        self.locks = get_lock_manager(state_dir)
+        self.registry = DeploymentRegistry(state_dir)
+        self.hcl_index = HCLIndex(state_dir / self.HCL_INDEX_FILE)
+        
+        if self.registry.is_empty():
+            self._import_metadata()
     
     def get_state_path(self, lab: Lab) -> Path:
         state_key = lab.relative_path.replace("/", "_")
@@ -24,51 +41,55 @@ class StateManager:
         return self.get_state_path(lab) / "terraform.tfstate"
     
     def is_deployed(self, lab: Lab) -> bool:
-        tfstate = self.get_tfstate_path(lab)
-        if not tfstate.exists():
-            return False
-        
         try:
-            with open(tfstate) as f:
-                state = json.load(f)
-                return len(state.get("resources", [])) > 0
-        except (json.JSONDecodeError, KeyError):
+            summary = TFSTATE_CACHE.summary(self.get_tfstate_path(lab))
+        except TFStateError:
             return False
+        
+        return summary is not None and summary.resource_count > 0
     
     def get_deployment_status(self, lab: Lab) -> DeploymentStatus:
-        if not self.is_deployed(lab):
+        try:
+            summary = TFSTATE_CACHE.summary(self.get_tfstate_path(lab))
+        except TFStateError:
+            return DeploymentStatus.NOT_DEPLOYED
+        
+        if not summary:
             return DeploymentStatus.NOT_DEPLOYED
         
-        tfstate = self.get_tfstate_path(lab)
+        # Fewer instances than the .tf files declare means an apply stopped short
+        if summary.status == DeploymentStatus.DEPLOYED and self.get_missing_resources(lab):
+            return DeploymentStatus.PARTIAL
+        return summary.status
+    
+    def analyze(self, lab: Lab) -> LabAnalysis:
+        return self.hcl_index.analyze(lab.terraform_dir)
+    
+    def get_missing_resources(self, lab: Lab) -> dict[str, int]:
         try:
-            with open(tfstate) as f:
-                state = json.load(f)
-                resources = state.get("resources", [])
-                
-                if len(resources) == 0:
-                    return DeploymentStatus.NOT_DEPLOYED
-                
-                has_errors = any(
-                    r.get("status") == "error" for r in resources
-                )
-                if has_errors:
-                    return DeploymentStatus.ERROR
-                
-                return DeploymentStatus.DEPLOYED
-        except Exception:
-            return DeploymentStatus.ERROR
+            summary = TFSTATE_CACHE.summary(self.get_tfstate_path(lab))
+        except TFStateError:
+            return {}
+        
+        if not summary or summary.resource_count == 0:
+            return {}
+        return self.analyze(lab).missing_resources(summary.type_histogram)
     
     def get_resource_count(self, lab: Lab) -> int:
-        tfstate = self.get_tfstate_path(lab)
-        if not tfstate.exists():
+        try:
+            summary = TFSTATE_CACHE.summary(self.get_tfstate_path(lab))
+        except TFStateError:
             return 0
         
+        return summary.resource_count if summary else 0
+    
+    def get_inventory(self, lab: Lab) -> ResourceInventory:
         try:
-            with open(tfstate) as f:
-                state = json.load(f)
-                return len(state.get("resources", []))
-        except Exception:
-            return 0
+            snapshot = TFSTATE_CACHE.load(self.get_tfstate_path(lab))
+        except TFStateError:
+            snapshot = None
+        
+        return ResourceInventory.from_resources(snapshot.resources if snapshot else [])
     
     def save_metadata(
         self,
@@ -81,20 +102,25 @@ class StateManager:
             lab_name=lab.relative_path,
             csp=lab.provider,
             last_action=action,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
             deployed_by=deployed_by,
             region=region,
             resources_count=self.get_resource_count(lab)
         )
         
         metadata_path = self.get_metadata_path(lab)
-        with open(metadata_path, "w") as f:
-            f.write(metadata.model_dump_json(indent=2))
+        tmp_path = metadata_path.with_suffix(".tmp")
+        with self.locks.registry_lock().hold(self.REGISTRY_LOCK_TIMEOUT):
+            with open(tmp_path, "w") as f:
+                f.write(metadata.model_dump_json(indent=2))
+            tmp_path.replace(metadata_path)
+        
+        self.registry.record_action(metadata, self.get_deployment_status(lab))
     
     def load_metadata(self, lab: Lab) -> Optional[LabMetadata]:
         metadata_path = self.get_metadata_path(lab)
         if not metadata_path.exists():
-            return None
+            return self.registry.get(lab.relative_path)
         
         try:
             with open(metadata_path) as f:
@@ -103,49 +129,63 @@ class StateManager:
         except Exception:
             return None
     
-    def get_active_deployments(self) -> list[tuple[str, LabMetadata]]:
-        active = []
-        
+    def record_event(self, lab: Lab, action: str, success: bool, details: str = "") -> None:
+        self.registry.record_event(
+            lab.relative_path,
+            action,
+            success,
+            os.getenv("USER", "unknown"),
+            details
+        )
+    
+    def _import_metadata(self) -> None:
+        # One-time backfill of the registry from the JSON metadata files
         for metadata_file in self.metadata_dir.glob("*.json"):
             try:
                 with open(metadata_file) as f:
-                    data = json.load(f)
-                    metadata = LabMetadata(**data)
-                    
-                    state_key = metadata_file.stem
-                    lab_path = state_key.replace("_", "/")
-                    
-                    tfstate = self.state_dir / state_key / "terraform.tfstate"
-                    if tfstate.exists():
-                        with open(tfstate) as tf:
-                            state = json.load(tf)
-                            if len(state.get("resources", [])) > 0:
-                                active.append((lab_path, metadata))
+                    metadata = LabMetadata(**json.load(f))
+                
+                summary = TFSTATE_CACHE.summary(
+                    self.state_dir / metadata_file.stem / "terraform.tfstate"
+                )
             except Exception:
                 continue
-        
-        return sorted(active, key=lambda x: x[1].timestamp, reverse=True)
+            
+            metadata.resources_count = summary.resource_count if summary else 0
+            self.registry.record_action(
+                metadata,
+                summary.status if summary else DeploymentStatus.NOT_DEPLOYED
+            )
+    
+    def get_active_deployments(self) -> list[tuple[str, LabMetadata]]:
+        return [(metadata.lab_name, metadata) for metadata in self.registry.active()]
     
     def cleanup_empty_states(self) -> int:
         cleaned = 0
         for state_dir in self.state_dir.iterdir():
-            if state_dir.name == ".metadata":
+            # .metadata, .locks, .telemetry and friends are vault's own, not lab state
+            if state_dir.name.startswith("."):
                 continue
             
             if not state_dir.is_dir():
                 continue
             
             tfstate = state_dir / "terraform.tfstate"
-            if tfstate.exists():
-                try:
-                    with open(tfstate) as f:
-                        state = json.load(f)
-                        if len(state.get("resources", [])) == 0:
-                            tfstate.unlink()
-                            if not any(state_dir.iterdir()):
-                                state_dir.rmdir()
-                            cleaned += 1
-                except Exception:
-                    pass
+            try:
+                # Labs with a terraform run in flight are left alone
+                with self.locks.state_lock(state_dir.name).hold(timeout=0):
+                    summary = TFSTATE_CACHE.summary(tfstate)
+                    if summary and summary.resource_count == 0:
+                        tfstate.unlink()
+                        summary_path(tfstate).unlink(missing_ok=True)
+                        TFSTATE_CACHE.invalidate(tfstate)
+                        shutil.rmtree(state_dir / self.DATA_DIR, ignore_errors=True)
+                        if not any(state_dir.iterdir()):
+                            state_dir.rmdir()
+                        cleaned += 1
+            except LockTimeout:
+                continue
+            except Exception:
+                pass
         
         return cleaned
\ No newline at end of file
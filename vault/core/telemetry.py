@@ -0,0 +1,159 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from vault.core.events import EventCallback, EventKind, TerraformEvent
+from vault.core.lab import Lab
+
+
+PHASES = ("init", "plan", "apply", "destroy", "drift")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    
+    ordered = sorted(values)
+    # Linear interpolation between the closest ranks
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class TimingStats:
+    name: str
+    durations: list[float] = field(default_factory=list)
+    failures: int = 0
+    
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+    
+    @property
+    def p50(self) -> float:
+        return percentile(self.durations, 50)
+    
+    @property
+    def p95(self) -> float:
+        return percentile(self.durations, 95)
+    
+    @property
+    def max(self) -> float:
+        return max(self.durations, default=0.0)
+
+
+@dataclass
+class TimingReport:
+    phases: dict[str, TimingStats] = field(default_factory=dict)
+    resources: dict[str, TimingStats] = field(default_factory=dict)
+    
+    def slowest_resources(self, limit: int = 10) -> list[TimingStats]:
+        return sorted(self.resources.values(), key=lambda s: s.p95, reverse=True)[:limit]
+
+
+class TimingRecorder:
+    TELEMETRY_DIR = ".telemetry"
+    
+    def __init__(self, state_dir: Path):
+        self.telemetry_dir = state_dir / self.TELEMETRY_DIR
+        self._lock = threading.Lock()
+    
+    def _get_path(self, state_key: str) -> Path:
+        return self.telemetry_dir / f"{state_key}.jsonl"
+    
+    def _append(self, lab: Lab, record: dict) -> None:
+        record["at"] = datetime.now(timezone.utc).isoformat()
+        path = self._get_path(lab.relative_path.replace("/", "_"))
+        
+        # Telemetry must never break a deployment
+        try:
+            with self._lock:
+                self.telemetry_dir.mkdir(parents=True, exist_ok=True)
+                with open(path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+    
+    def record_phase(self, lab: Lab, phase: str, seconds: float, success: bool = True) -> None:
+        self._append(lab, {
+            "type": "phase",
+            "name": phase,
+            "seconds": round(seconds, 3),
+            "success": success
+        })
+    
+    def record_resource(self, lab: Lab, resource_type: str, action: str, seconds: float) -> None:
+        self._append(lab, {
+            "type": "resource",
+            "name": resource_type,
+            "action": action,
+            "seconds": round(seconds, 3)
+        })
+    
+    @contextmanager
+    def phase(self, lab: Lab, name: str) -> Iterator[None]:
+        started = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.record_phase(lab, name, time.monotonic() - started, success)
+    
+    def resource_recorder(
+        self,
+        lab: Lab,
+        on_event: Optional[EventCallback] = None
+    ) -> EventCallback:
+        def record(event: TerraformEvent) -> None:
+            if event.kind == EventKind.RESOURCE_COMPLETE and event.resource_type:
+                self.record_resource(lab, event.resource_type, event.action, event.elapsed)
+            if on_event:
+                on_event(event)
+        return record
+    
+    def _records(self, lab: Optional[Lab]) -> Iterator[dict]:
+        if lab:
+            paths = [self._get_path(lab.relative_path.replace("/", "_"))]
+        else:
+            paths = sorted(self.telemetry_dir.glob("*.jsonl"))
+        
+        for path in paths:
+            try:
+                with open(path) as f:
+                    for line in f:
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+            except OSError:
+                continue
+    
+    def report(self, lab: Optional[Lab] = None) -> TimingReport:
+        report = TimingReport()
+        
+        for record in self._records(lab):
+            name = record.get("name", "")
+            seconds = float(record.get("seconds", 0) or 0)
+            
+            if record.get("type") == "phase":
+                stats = report.phases.setdefault(name, TimingStats(name=name))
+                if not record.get("success", True):
+                    stats.failures += 1
+                    continue
+            elif record.get("type") == "resource":
+                key = f"{name} ({record.get('action', '')})"
+                stats = report.resources.setdefault(key, TimingStats(name=key))
+            else:
+                continue
+            
+            stats.durations.append(seconds)
+        
+        return report
@@ -1,35 +1,97 @@
+import functools
+import hashlib
 import json
+import os
+import shutil
 import subprocess
+import threading
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Concatenate, Iterator, Optional, ParamSpec, TypeVar
 
-from vault.core.lab import DeploymentResult, Lab, TerraformOutput
+from vault.core.checkpoint import Checkpoint
+from vault.core.events import EventCallback, EventKind, TerraformEvent, parse_event
+from vault.core.lab import DeploymentResult, DeploymentStatus, Lab, PlanResult, TerraformOutput
+from vault.core.locks import LockTimeout, get_lock_manager
+from vault.core.process import ManagedProcess, ProcessAborted
+from vault.core.state import StateManager
+from vault.core.telemetry import TimingRecorder
+from vault.core.tfstate import (
+    TFSTATE_CACHE,
+    StateSummary,
+    TFStateError,
+    TFStateSnapshot,
+    write_summary,
+)
+from vault.utils.probe import get_tool_probe
 
 
 class TerraformError(Exception):
     pass
 
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _with_state_lock(
+    method: Callable[Concatenate["TerraformWrapper", Lab, P], R]
+) -> Callable[Concatenate["TerraformWrapper", Lab, P], R]:
+    @functools.wraps(method)
+    def wrapper(self: "TerraformWrapper", lab: Lab, /, *args: P.args, **kwargs: P.kwargs) -> R:
+        with self._state_lock(lab):
+            return method(self, lab, *args, **kwargs)
+    return wrapper
+
+
 class TerraformWrapper:
-    def __init__(self, state_dir: Path):
+    DATA_DIR = ".terraform"
+    CLI_CONFIG_FILE = ".terraformrc"
+    INIT_FINGERPRINT_FILE = "vault-init.sha256"
+    PLAN_FILE = "vault.tfplan"
+    PLAN_META_FILE = "vault.tfplan.json"
+    PLAN_CACHE_FILE = "plan-cache.json"
+    PLAN_CACHE_DESTROY_FILE = "plan-cache-destroy.json"
+    CHECKPOINT_FILE = "vault-checkpoint.json"
+    STREAM_ERROR_LINES = 20
+    STREAM_OUTPUT_LINES = 40
+    LOCK_INFO_FILE = ".terraform.tfstate.lock.info"
+    
+    # Seconds before a terraform subcommand is interrupted
+    PHASE_TIMEOUTS: dict[str, float] = {
+        "init": 15 * 60,
+        "plan": 30 * 60,
+        "apply": 2 * 60 * 60,
+        "destroy": 2 * 60 * 60,
+    }
+    DEFAULT_TIMEOUT = 5 * 60
+    LOCK_TIMEOUT = 30.0
+    
+    def __init__(self, state_manager: StateManager, timeouts: Optional[dict[str, float]] = None):
+        state_dir = state_manager.state_dir
         self.state_dir = state_dir
+        self.state_manager = state_manager
+        self.terraform_version = ""
+        self.telemetry = TimingRecorder(state_dir)
+        self.timeouts = {**self.PHASE_TIMEOUTS, **(timeouts or {})}
+        self._processes: set[ManagedProcess] = set()
+        self._processes_lock = threading.Lock()
+        self.locks = get_lock_manager(state_dir)
         self._check_terraform_installed()
     
     def _check_terraform_installed(self) -> None:
-        try:
-            result = subprocess.run(
-                ["terraform", "version"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            if result.returncode != 0:
-                raise TerraformError("Terraform is not properly installed")
-        except FileNotFoundError:
+        probe = get_tool_probe().probe("terraform")
+        
+        if not probe.path:
             raise TerraformError(
                 "Terraform not found. Please install Terraform: "
                 "https://www.terraform.io/downloads"
             )
+        if not probe.installed:
+            raise TerraformError("Terraform is not properly installed")
+        
+        self.terraform_version = probe.version or ""
     
     def _get_state_path(self, lab: Lab) -> Path:
         state_key = lab.relative_path.replace("/", "_")
@@ -37,43 +99,188 @@ class TerraformWrapper:
         state_path.mkdir(parents=True, exist_ok=True)
         return state_path
     
+    def _get_data_dir(self, lab: Lab) -> Path:
+        return (self._get_state_path(lab) / self.DATA_DIR).resolve()
+    
+    @property
+    def cli_config_file(self) -> Path:
+        return self.state_dir / self.CLI_CONFIG_FILE
+    
+    def _terraform_env(self, data_dir: Optional[Path] = None) -> Optional[dict[str, str]]:
+        overrides = {}
+        if data_dir is not None:
+            overrides["TF_DATA_DIR"] = str(data_dir)
+        
+        # Written by 'vault prefetch' to install providers from the local mirror
+        if self.cli_config_file.exists():
+            overrides["TF_CLI_CONFIG_FILE"] = str(self.cli_config_file.resolve())
+        
+        if not overrides:
+            return None
+        return {**os.environ, **overrides}
+    
+    @contextmanager
+    def _state_lock(self, lab: Lab) -> Iterator[None]:
+        state_key = lab.relative_path.replace("/", "_")
+        try:
+            with self.locks.state_lock(state_key).hold(self.LOCK_TIMEOUT):
+                yield
+        except LockTimeout as e:
+            raise TerraformError(f"{lab.relative_path} is busy in another vault process: {e}")
+    
+    def cancel_all(self) -> None:
+        with self._processes_lock:
+            processes = list(self._processes)
+        
+        # Stopped side by side so the grace periods overlap instead of adding up
+        threads = [threading.Thread(target=process.cancel, daemon=True) for process in processes]
+        for thread in threads:
+            thread.start()
+        
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            # A second Ctrl+C skips the grace periods
+            for process in processes:
+                process.kill()
+    
+    def _release_stale_lock(self, data_dir: Optional[Path]) -> None:
+        # A killed terraform leaves the local backend's lock info behind
+        if data_dir is not None:
+            (data_dir.parent / self.LOCK_INFO_FILE).unlink(missing_ok=True)
+    
+    @contextmanager
+    def _managed(
+        self,
+        cmd: list[str],
+        cwd: Path,
+        data_dir: Optional[Path]
+    ) -> Iterator[ManagedProcess]:
+        process = ManagedProcess(
+            cmd,
+            cwd,
+            env=self._terraform_env(data_dir),
+            timeout=self.timeouts.get(cmd[1], self.DEFAULT_TIMEOUT)
+        )
+        
+        with self._processes_lock:
+            self._processes.add(process)
+        try:
+            yield process
+        except FileNotFoundError:
+            raise TerraformError("Terraform not found")
+        except ProcessAborted as e:
+            if e.forced:
+                self._release_stale_lock(data_dir)
+            raise TerraformError(f"Terraform command aborted: {e}")
+        finally:
+            with self._processes_lock:
+                self._processes.discard(process)
+    
     def _run_terraform(
         self,
         args: list[str],
         cwd: Path,
-        capture_output: bool = False
-    ) -> subprocess.CompletedProcess:
-        cmd = ["terraform"] + args
+        capture_output: bool = False,
+        data_dir: Optional[Path] = None
+    ) -> subprocess.CompletedProcess[str]:
+        with self._managed(["terraform"] + args, cwd, data_dir) as process:
+            result = process.run(capture_output=capture_output)
         
-        try:
-            if capture_output:
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
+        if result.returncode != 0:
+            error_msg = result.stderr if capture_output else f"exit code {result.returncode}"
+            raise TerraformError(f"Terraform command failed: {error_msg}")
+        return result
+    
+    def _stream_terraform(
+        self,
+        args: list[str],
+        cwd: Path,
+        on_event: EventCallback,
+        data_dir: Optional[Path] = None
+    ) -> None:
+        cmd = ["terraform", args[0], "-json"] + args[1:]
+        
+        # Only the most recent errors are kept so huge runs stay bounded
+        errors: deque[str] = deque(maxlen=self.STREAM_ERROR_LINES)
+        # Plain-text output such as provider crash dumps or plugin panics
+        raw_output: deque[str] = deque(maxlen=self.STREAM_OUTPUT_LINES)
+        
+        def handle_line(line: str) -> None:
+            event = parse_event(line)
+            if event is None:
+                return
+            
+            if event.is_error:
+                errors.append(event.message)
+            elif event.raw:
+                raw_output.append(event.message)
+            
+            on_event(event)
+        
+        with self._managed(cmd, cwd, data_dir) as process:
+            returncode = process.stream(handle_line)
+        
+        if returncode != 0:
+            if errors:
+                error_msg = "\n".join(errors)
+            elif raw_output:
+                error_msg = f"exit code {returncode}\n" + "\n".join(raw_output)
             else:
-                result = subprocess.run(
-                    cmd,
-                    cwd=cwd,
-                    check=True
-                )
-            return result
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if hasattr(e, 'stderr') else str(e)
+                error_msg = f"exit code {returncode}"
             raise TerraformError(f"Terraform command failed: {error_msg}")
     
-    def init(self, lab: Lab, var_files: list[Path]) -> None:
+    def _init_fingerprint(self, lab: Lab, tfstate_path: Path) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.terraform_version.encode())
+        digest.update(str(tfstate_path).encode())
+        
+        config_files = sorted(
+            f for f in lab.terraform_dir.rglob("*.tf")
+            if ".terraform" not in f.relative_to(lab.terraform_dir).parts
+        )
+        lockfile = lab.terraform_dir / ".terraform.lock.hcl"
+        if lockfile.exists():
+            config_files.append(lockfile)
+        
+        # Local modules outside the lab, e.g. source = "../modules/lab-vpc"
+        terraform_dir = lab.terraform_dir.resolve()
+        for config_dir in self.state_manager.hcl_index.analyze(lab.terraform_dir).config_dirs:
+            if not config_dir.is_relative_to(terraform_dir):
+                config_files.extend(sorted(config_dir.glob("*.tf")))
+        
+        for config_file in config_files:
+            digest.update(os.path.relpath(config_file, lab.terraform_dir).encode())
+            digest.update(config_file.read_bytes())
+        
+        return digest.hexdigest()
+    
+    def is_initialized(self, lab: Lab) -> bool:
+        state_path = self._get_state_path(lab)
+        tfstate_path = (state_path / "terraform.tfstate").resolve()
+        fingerprint_file = self._get_data_dir(lab) / self.INIT_FINGERPRINT_FILE
+        
+        if not fingerprint_file.exists():
+            return False
+        
+        try:
+            return fingerprint_file.read_text().strip() == self._init_fingerprint(lab, tfstate_path)
+        except OSError:
+            return False
+    
+    @_with_state_lock
+    def init(self, lab: Lab, var_files: list[Path], force: bool = False) -> bool:
+        if not force and self.is_initialized(lab):
+            return False
+        
         state_path = self._get_state_path(lab)
         tfstate_path = (state_path / "terraform.tfstate").resolve()
         
-        # Remove cached terraform state to force reconfiguration
-        terraform_dir = lab.terraform_dir / ".terraform"
-        if terraform_dir.exists():
-            import shutil
-            shutil.rmtree(terraform_dir)
+        # Remove this state key's data dir to force reconfiguration
+        data_dir = self._get_data_dir(lab)
+        if data_dir.exists():
+            shutil.rmtree(data_dir)
         
         args = [
             "init",
@@ -81,13 +288,118 @@ class TerraformWrapper:
             "-reconfigure"
         ]
         
-        self._run_terraform(args, lab.terraform_dir, capture_output=True)
+        with self.telemetry.phase(lab, "init"):
+            self._run_terraform(args, lab.terraform_dir, capture_output=True, data_dir=data_dir)
+        
+        # Terraform always writes .terraform.lock.hcl next to the config and has
+        # no setting to relocate it, so it stays in the lab directory. Runs for
+        # the same lab are serialised by the state lock, so they never race on it.
+        # Fingerprint after init so a freshly written lockfile is included
+        fingerprint_file = data_dir / self.INIT_FINGERPRINT_FILE
+        fingerprint_file.write_text(self._init_fingerprint(lab, tfstate_path))
+        return True
+    
+    def _get_checkpoint_path(self, lab: Lab) -> Path:
+        return self._get_state_path(lab) / self.CHECKPOINT_FILE
+    
+    def load_checkpoint(self, lab: Lab) -> Optional[Checkpoint]:
+        return Checkpoint.load(self._get_checkpoint_path(lab))
+    
+    def clear_checkpoint(self, lab: Lab) -> None:
+        self._get_checkpoint_path(lab).unlink(missing_ok=True)
+    
+    def _save_checkpoint(self, lab: Lab, checkpoint: Checkpoint, error: str) -> None:
+        checkpoint.error_message = error
+        try:
+            snapshot = self._load_tfstate(lab)
+        except TFStateError:
+            snapshot = None
+        if snapshot:
+            checkpoint.serial = snapshot.serial
+            checkpoint.resource_count = snapshot.resource_count
+        checkpoint.save(self._get_checkpoint_path(lab))
+    
+    def _saved_plan_addresses(self, lab: Lab) -> list[str]:
+        try:
+            result = self._run_terraform(
+                ["show", "-json", str(self._get_plan_path(lab).resolve())],
+                lab.terraform_dir,
+                capture_output=True,
+                data_dir=self._get_data_dir(lab)
+            )
+            plan = json.loads(result.stdout)
+        except (TerraformError, json.JSONDecodeError):
+            return []
+        
+        return [
+            change["address"]
+            for change in plan.get("resource_changes", [])
+            if change.get("change", {}).get("actions") not in (["no-op"], ["read"])
+        ]
     
+    def _record_state(self, lab: Lab) -> None:
+        try:
+            snapshot = self._load_tfstate(lab)
+        except TFStateError:
+            return
+        
+        if snapshot:
+            tfstate_path = self._get_state_path(lab) / "terraform.tfstate"
+            write_summary(tfstate_path, StateSummary.from_snapshot(snapshot))
+        
+        self.state_manager.registry.record_state(
+            lab.relative_path,
+            lab.provider.value,
+            snapshot.status if snapshot else DeploymentStatus.NOT_DEPLOYED,
+            snapshot.resource_count if snapshot else 0
+        )
+    
+    def _get_plan_path(self, lab: Lab) -> Path:
+        return self._get_state_path(lab) / self.PLAN_FILE
+    
+    def _var_files_digest(self, var_files: list[Path]) -> str:
+        digest = hashlib.sha256()
+        for var_file in var_files:
+            digest.update(str(var_file.resolve()).encode())
+            if var_file.exists():
+                digest.update(var_file.read_bytes())
+        return digest.hexdigest()
+    
+    def _plan_fingerprint(self, lab: Lab, var_files: list[Path]) -> dict:
+        tfstate_path = (self._get_state_path(lab) / "terraform.tfstate").resolve()
+        return {
+            "serial": self._get_state_serial(lab),
+            "var_files": self._var_files_digest(var_files),
+            "config": self._init_fingerprint(lab, tfstate_path),
+        }
+    
+    def has_current_plan(self, lab: Lab, var_files: list[Path]) -> bool:
+        plan_path = self._get_plan_path(lab)
+        meta_path = plan_path.with_name(self.PLAN_META_FILE)
+        
+        if not plan_path.exists() or not meta_path.exists():
+            return False
+        
+        try:
+            saved = json.loads(meta_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return False
+        
+        return saved == self._plan_fingerprint(lab, var_files)
+    
+    def discard_plan(self, lab: Lab) -> None:
+        plan_path = self._get_plan_path(lab)
+        plan_path.unlink(missing_ok=True)
+        plan_path.with_name(self.PLAN_META_FILE).unlink(missing_ok=True)
+    
+    @_with_state_lock
     def plan(
         self,
         lab: Lab,
         var_files: list[Path],
-        destroy: bool = False
+        destroy: bool = False,
+        save_plan: bool = False,
+        targets: Optional[list[str]] = None
     ) -> str:
         self.init(lab, var_files)
         
@@ -99,32 +411,152 @@ class TerraformWrapper:
         for var_file in var_files:
             args.extend(["-var-file", str(var_file)])
         
-        result = self._run_terraform(
-            args,
-            lab.terraform_dir,
-            capture_output=True
-        )
-        return result.stdout
+        for target in targets or []:
+            args.append(f"-target={target}")
+        
+        if save_plan:
+            self.discard_plan(lab)
+            plan_path = self._get_plan_path(lab)
+            args.append(f"-out={plan_path.resolve()}")
+        
+        with self.telemetry.phase(lab, "plan"):
+            result = self._run_terraform(
+                args,
+                lab.terraform_dir,
+                capture_output=True,
+                data_dir=self._get_data_dir(lab)
+            )
+            plan_output = result.stdout
+        
+        if save_plan:
+            meta_path = plan_path.with_name(self.PLAN_META_FILE)
+            meta_path.write_text(json.dumps(self._plan_fingerprint(lab, var_files)))
+        
+        return plan_output
+    
+    def _plan_cache_key(self, lab: Lab, var_files: list[Path], destroy: bool) -> str:
+        tfstate_path = (self._get_state_path(lab) / "terraform.tfstate").resolve()
+        digest = hashlib.sha256()
+        digest.update(self._init_fingerprint(lab, tfstate_path).encode())
+        digest.update(self._var_files_digest(var_files).encode())
+        digest.update(str(self._get_state_serial(lab)).encode())
+        digest.update(b"destroy" if destroy else b"apply")
+        return digest.hexdigest()
+    
+    def get_plan(
+        self,
+        lab: Lab,
+        var_files: list[Path],
+        destroy: bool = False,
+        refresh: bool = False
+    ) -> PlanResult:
+        cache_name = self.PLAN_CACHE_DESTROY_FILE if destroy else self.PLAN_CACHE_FILE
+        cache_file = self._get_state_path(lab) / cache_name
+        cache_key = self._plan_cache_key(lab, var_files, destroy)
+        
+        if not refresh and cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text())
+                if cached.get("key") == cache_key:
+                    result = PlanResult(**cached["result"])
+                    result.cached = True
+                    return result
+            except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+                pass
+        
+        result = PlanResult.from_output(self.plan(lab, var_files, destroy=destroy))
+        
+        # Init during planning may have rewritten the lockfile, so key again
+        cache_file.write_text(json.dumps({
+            "key": self._plan_cache_key(lab, var_files, destroy),
+            "result": result.model_dump(mode="json")
+        }))
+        return result
     
+    @_with_state_lock
+    def detect_drift(self, lab: Lab, var_files: list[Path]) -> list[TerraformEvent]:
+        self.init(lab, var_files)
+        
+        args = ["plan", "-refresh-only", "-no-color", "-input=false"]
+        for var_file in var_files:
+            args.extend(["-var-file", str(var_file)])
+        
+        drifted: list[TerraformEvent] = []
+        
+        def collect(event: TerraformEvent) -> None:
+            if event.kind == EventKind.RESOURCE_DRIFT:
+                drifted.append(event)
+        
+        with self.telemetry.phase(lab, "drift"):
+            self._stream_terraform(args, lab.terraform_dir, collect, data_dir=self._get_data_dir(lab))
+        
+        return drifted
+    
+    @_with_state_lock
     def apply(
         self,
         lab: Lab,
         var_files: list[Path],
-        auto_approve: bool = False
+        auto_approve: bool = False,
+        use_saved_plan: bool = False,
+        quiet: bool = False,
+        on_event: Optional[EventCallback] = None,
+        targets: Optional[list[str]] = None
     ) -> DeploymentResult:
         self.init(lab, var_files)
+        checkpoint = Checkpoint(operation="apply", phase="plan" if use_saved_plan else "init")
+        plan_serial = self._get_state_serial(lab)
+        success = False
         
         args = ["apply", "-no-color", "-compact-warnings"]
         
-        for var_file in var_files:
-            args.extend(["-var-file", str(var_file)])
+        if quiet:
+            args.append("-input=false")
         
-        if auto_approve:
-            args.append("-auto-approve")
+        if use_saved_plan:
+            if not self.has_current_plan(lab, var_files):
+                self.discard_plan(lab)
+                return DeploymentResult(
+                    success=False,
+                    lab_name=lab.relative_path,
+                    error_message=(
+                        "Saved plan is stale (state or variables changed since planning). "
+                        "Re-run the plan and try again."
+                    )
+                )
+            
+            # A saved plan already carries its variables, targets and approval
+            args.append(str(self._get_plan_path(lab).resolve()))
+        else:
+            for var_file in var_files:
+                args.extend(["-var-file", str(var_file)])
+            
+            for target in targets or []:
+                args.append(f"-target={target}")
+            
+            if auto_approve:
+                args.append("-auto-approve")
         
         try:
-            self._run_terraform(args, lab.terraform_dir)
+            with self.telemetry.phase(lab, "apply"):
+                # JSON output is non-interactive, so stream only when no prompt is needed
+                if on_event and (use_saved_plan or auto_approve):
+                    self._stream_terraform(
+                        args,
+                        lab.terraform_dir,
+                        checkpoint.track(self.telemetry.resource_recorder(lab, on_event)),
+                        data_dir=self._get_data_dir(lab)
+                    )
+                else:
+                    self._run_terraform(
+                        args,
+                        lab.terraform_dir,
+                        capture_output=quiet,
+                        data_dir=self._get_data_dir(lab)
+                    )
             
+            success = True
+            self.clear_checkpoint(lab)
             outputs = self.get_outputs(lab)
             resource_count = self._get_resource_count(lab)
             
@@ -135,60 +567,88 @@ class TerraformWrapper:
                 resources_created=resource_count
             )
         except TerraformError as e:
+            # Applying a saved plan does not stream planned_change messages
+            if use_saved_plan and not checkpoint.planned:
+                checkpoint.planned = self._saved_plan_addresses(lab)
+            self._save_checkpoint(lab, checkpoint, str(e))
             return DeploymentResult(
                 success=False,
                 lab_name=lab.relative_path,
                 error_message=str(e)
             )
+        finally:
+            self._record_state(lab)
+            # A saved plan that failed before changing any state can be applied again on resume
+            if use_saved_plan and (success or self._get_state_serial(lab) != plan_serial):
+                self.discard_plan(lab)
     
+    @_with_state_lock
     def destroy(
         self,
         lab: Lab,
         var_files: list[Path],
-        auto_approve: bool = False
+        auto_approve: bool = False,
+        quiet: bool = False,
+        on_event: Optional[EventCallback] = None,
+        targets: Optional[list[str]] = None
     ) -> bool:
         self.init(lab, var_files)
+        checkpoint = Checkpoint(operation="destroy", phase="init")
         
         args = ["destroy", "-no-color", "-compact-warnings"]
         
+        if quiet:
+            args.append("-input=false")
+        
         for var_file in var_files:
             args.extend(["-var-file", str(var_file)])
         
+        for target in targets or []:
+            args.append(f"-target={target}")
+        
         if auto_approve:
             args.append("-auto-approve")
         
         try:
-            self._run_terraform(args, lab.terraform_dir)
+            with self.telemetry.phase(lab, "destroy"):
+                if on_event and auto_approve:
+                    self._stream_terraform(
+                        args,
+                        lab.terraform_dir,
+                        checkpoint.track(self.telemetry.resource_recorder(lab, on_event)),
+                        data_dir=self._get_data_dir(lab)
+                    )
+                else:
+                    self._run_terraform(
+                        args,
+                        lab.terraform_dir,
+                        capture_output=quiet,
+                        data_dir=self._get_data_dir(lab)
+                    )
+            self.clear_checkpoint(lab)
             return True
-        except TerraformError:
+        except TerraformError as e:
+            self._save_checkpoint(lab, checkpoint, str(e))
             return False
+        finally:
+            self._record_state(lab)
     
     def get_outputs(self, lab: Lab) -> dict[str, TerraformOutput]:
-        outputs = self._get_outputs_from_state(lab)
+        outputs = self.get_state_outputs(lab)
         if outputs:
             return outputs
         
-        terraform_dir = lab.terraform_dir / ".terraform"
-        if not terraform_dir.exists():
-            try:
-                state_path = self._get_state_path(lab)
-                tfstate_path = (state_path / "terraform.tfstate").resolve()
-                
-                args = [
-                    "init",
-                    f"-backend-config=path={tfstate_path}",
-                    "-reconfigure"
-                ]
-                
-                self._run_terraform(args, lab.terraform_dir, capture_output=True)
-            except Exception:
-                return {}
+        try:
+            self.init(lab, [])
+        except Exception:
+            return {}
         
         try:
             result = self._run_terraform(
                 ["output", "-json"],
                 lab.terraform_dir,
-                capture_output=True
+                capture_output=True,
+                data_dir=self._get_data_dir(lab)
             )
             
             raw_outputs = json.loads(result.stdout)
@@ -210,7 +670,8 @@ class TerraformWrapper:
             result = self._run_terraform(
                 ["state", "list"],
                 lab.terraform_dir,
-                capture_output=True
+                capture_output=True,
+                data_dir=self._get_data_dir(lab)
             )
             return [
                 line.strip()
@@ -220,53 +681,52 @@ class TerraformWrapper:
         except Exception:
             return []
 
-    def _get_outputs_from_state(self, lab: Lab) -> dict[str, TerraformOutput]:
+    def _load_tfstate(self, lab: Lab) -> Optional[TFStateSnapshot]:
         try:
-            state_path = self._get_state_path(lab)
-            tfstate = state_path / "terraform.tfstate"
-            
-            if not tfstate.exists():
-                return {}
-            
-            with open(tfstate) as f:
-                state = json.load(f)
-                raw_outputs = state.get("outputs", {})
-                outputs = {}
-                
-                for key, data in raw_outputs.items():
-                    try:
-                        outputs[key] = TerraformOutput(
-                            value=data.get("value"),
-                            sensitive=data.get("sensitive", False),
-                            type=data.get("type", "")
-                        )
-                    except Exception:
-                        pass
-                
-                return outputs
-        except Exception:
+            return TFSTATE_CACHE.load(self._get_state_path(lab) / "terraform.tfstate")
+        except TFStateError:
+            return None
+    
+    def get_state_outputs(self, lab: Lab) -> dict[str, TerraformOutput]:
+        snapshot = self._load_tfstate(lab)
+        if not snapshot:
             return {}
         
-    def _get_resource_count(self, lab: Lab) -> int:
-        state_path = self._get_state_path(lab)
-        tfstate = state_path / "terraform.tfstate"
-        
-        if not tfstate.exists():
-            return 0
+        outputs = {}
+        for key, data in snapshot.outputs.items():
+            try:
+                outputs[key] = TerraformOutput(
+                    value=data.get("value"),
+                    sensitive=data.get("sensitive", False),
+                    type=data.get("type", "")
+                )
+            except Exception:
+                pass
         
+        return outputs
+    
+    def _load_summary(self, lab: Lab) -> Optional[StateSummary]:
         try:
-            with open(tfstate) as f:
-                state = json.load(f)
-                return len(state.get("resources", []))
-        except Exception:
-            return 0
+            return TFSTATE_CACHE.summary(self._get_state_path(lab) / "terraform.tfstate")
+        except TFStateError:
+            return None
+    
+    def _get_resource_count(self, lab: Lab) -> int:
+        summary = self._load_summary(lab)
+        return summary.resource_count if summary else 0
+    
+    def _get_state_serial(self, lab: Lab) -> int:
+        summary = self._load_summary(lab)
+        return summary.serial if summary else 0
     
     def validate(self, lab: Lab) -> tuple[bool, str]:
         try:
+            self.init(lab, [])
             result = self._run_terraform(
                 ["validate", "-no-color"],
                 lab.terraform_dir,
-                capture_output=True
+                capture_output=True,
+                data_dir=self._get_data_dir(lab)
             )
             return True, result.stdout
         except TerraformError as e:
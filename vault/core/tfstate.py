@@ -0,0 +1,336 @@
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from vault.core.lab import DeploymentStatus
+
+
+class TFStateError(Exception):
+    pass
+
+
+@dataclass
+class TFStateSnapshot:
+    serial: int = 0
+    lineage: str = ""
+    resources: list[dict[str, Any]] = field(default_factory=list)
+    outputs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    
+    @property
+    def resource_count(self) -> int:
+        return len(self.resources)
+    
+    @property
+    def resource_statuses(self) -> dict[str, str]:
+        statuses = {}
+        for resource in self.resources:
+            address = resource_address(resource)
+            
+            if resource.get("status") == "error":
+                statuses[address] = "error"
+            elif any(i.get("status") == "tainted" for i in resource.get("instances", [])):
+                statuses[address] = "tainted"
+            else:
+                statuses[address] = "ok"
+        
+        return statuses
+    
+    @property
+    def has_errors(self) -> bool:
+        return any(status != "ok" for status in self.resource_statuses.values())
+    
+    @property
+    def status(self) -> DeploymentStatus:
+        if self.resource_count == 0:
+            return DeploymentStatus.NOT_DEPLOYED
+        if self.has_errors:
+            return DeploymentStatus.ERROR
+        return DeploymentStatus.DEPLOYED
+
+
+def resource_address(resource: dict[str, Any]) -> str:
+    parts = []
+    if resource.get("module"):
+        parts.append(resource["module"])
+    if resource.get("mode") == "data":
+        parts.append("data")
+    parts.append(f"{resource.get('type', '')}.{resource.get('name', '')}")
+    return ".".join(parts)
+
+
+# Only what the CLI reads is kept; instance attributes can be megabytes
+_RESOURCE_KEYS = ("module", "mode", "type", "name", "provider", "status")
+_INSTANCE_KEYS = ("status", "index_key", "deposed")
+_SNAPSHOT_KEYS = ("serial", "lineage", "outputs")
+
+_CHUNK_SIZE = 64 * 1024
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _StateStream:
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        
+        # Grow reads with the pending value so huge values don't re-decode per chunk
+        chunk = self.f.read(max(_CHUNK_SIZE, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if char not in expected or not char:
+            raise TFStateError(f"Expected one of {expected!r}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+    
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise TFStateError(str(e))
+            
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            
+            self.pos = end
+            return value
+
+
+def _slim_resource(resource: dict[str, Any]) -> dict[str, Any]:
+    slim = {key: resource[key] for key in _RESOURCE_KEYS if key in resource}
+    slim["instances"] = [
+        {key: instance[key] for key in _INSTANCE_KEYS if key in instance}
+        for instance in resource.get("instances", [])
+    ]
+    return slim
+
+
+def read_tfstate(f: TextIO) -> TFStateSnapshot:
+    # Walks the top-level object and decodes one resource at a time, so
+    # memory is bounded by the largest resource rather than the whole file
+    stream = _StateStream(f)
+    fields: dict[str, Any] = {}
+    resources: list[dict[str, Any]] = []
+    
+    stream.take("{")
+    if stream.peek() == "}":
+        stream.take("}")
+    else:
+        while True:
+            key = stream.value()
+            stream.take(":")
+            
+            if key == "resources":
+                stream.take("[")
+                if stream.peek() == "]":
+                    stream.take("]")
+                else:
+                    while True:
+                        resource = stream.value()
+                        if isinstance(resource, dict):
+                            resources.append(_slim_resource(resource))
+                        if stream.take(",]") == "]":
+                            break
+            elif key in _SNAPSHOT_KEYS:
+                fields[key] = stream.value()
+            else:
+                stream.value()
+            
+            if stream.take(",}") == "}":
+                break
+    
+    return TFStateSnapshot(
+        serial=int(fields.get("serial", 0)),
+        lineage=fields.get("lineage", ""),
+        resources=resources,
+        outputs=fields.get("outputs", {})
+    )
+
+
+SUMMARY_FILE = "vault-summary.json"
+SUMMARY_FORMAT = 1
+
+# Terraform writes version, serial and lineage ahead of the resources
+_HEAD_SIZE = 4096
+_HEAD_SERIAL = re.compile(r'"serial"\s*:\s*(\d+)')
+_HEAD_LINEAGE = re.compile(r'"lineage"\s*:\s*"([^"]*)"')
+
+
+@dataclass
+class StateSummary:
+    serial: int
+    lineage: str
+    resource_count: int
+    status: DeploymentStatus
+    outputs_digest: str
+    type_histogram: dict[str, int] = field(default_factory=dict)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: TFStateSnapshot) -> "StateSummary":
+        histogram: dict[str, int] = {}
+        for resource in snapshot.resources:
+            if resource.get("mode", "managed") == "managed":
+                resource_type = resource.get("type", "")
+                histogram[resource_type] = histogram.get(resource_type, 0) + len(resource.get("instances", []))
+        
+        return cls(
+            serial=snapshot.serial,
+            lineage=snapshot.lineage,
+            resource_count=snapshot.resource_count,
+            status=snapshot.status,
+            outputs_digest=hashlib.sha256(
+                json.dumps(snapshot.outputs, sort_keys=True, default=str).encode()
+            ).hexdigest(),
+            type_histogram=histogram
+        )
+
+
+def summary_path(tfstate: Path) -> Path:
+    return tfstate.with_name(SUMMARY_FILE)
+
+
+def _read_head(tfstate: Path) -> tuple[Optional[int], str]:
+    try:
+        with open(tfstate) as f:
+            head = f.read(_HEAD_SIZE)
+    except (OSError, UnicodeDecodeError):
+        return None, ""
+    
+    serial = _HEAD_SERIAL.search(head)
+    lineage = _HEAD_LINEAGE.search(head)
+    return (int(serial.group(1)) if serial else None), (lineage.group(1) if lineage else "")
+
+
+def write_summary(tfstate: Path, summary: StateSummary) -> None:
+    data = {
+        "format": SUMMARY_FORMAT,
+        "serial": summary.serial,
+        "lineage": summary.lineage,
+        "resource_count": summary.resource_count,
+        "status": summary.status.value,
+        "outputs_digest": summary.outputs_digest,
+        "type_histogram": summary.type_histogram
+    }
+    
+    path = summary_path(tfstate)
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, indent=2))
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
+def load_summary(tfstate: Path) -> Optional[StateSummary]:
+    try:
+        data = json.loads(summary_path(tfstate).read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    
+    if not isinstance(data, dict) or data.get("format") != SUMMARY_FORMAT:
+        return None
+    
+    # Only trusted while it describes the state that is on disk now
+    serial, lineage = _read_head(tfstate)
+    if serial is None or serial != data.get("serial") or lineage != data.get("lineage"):
+        return None
+    
+    try:
+        return StateSummary(
+            serial=data["serial"],
+            lineage=data["lineage"],
+            resource_count=int(data["resource_count"]),
+            status=DeploymentStatus(data["status"]),
+            outputs_digest=data.get("outputs_digest", ""),
+            type_histogram=data.get("type_histogram", {})
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TFStateCache:
+    def __init__(self):
+        self._entries: dict[Path, tuple[tuple[int, int], TFStateSnapshot]] = {}
+        self._lock = threading.Lock()
+    
+    def load(self, tfstate: Path) -> Optional[TFStateSnapshot]:
+        try:
+            stat = tfstate.stat()
+        except FileNotFoundError:
+            return None
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        path = tfstate.resolve()
+        
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == key:
+                return entry[1]
+        
+        snapshot = self._parse(tfstate)
+        
+        with self._lock:
+            self._entries[path] = (key, snapshot)
+        
+        return snapshot
+    
+    def invalidate(self, tfstate: Path) -> None:
+        with self._lock:
+            self._entries.pop(tfstate.resolve(), None)
+    
+    def _parse(self, tfstate: Path) -> TFStateSnapshot:
+        try:
+            with open(tfstate) as f:
+                return read_tfstate(f)
+        except (OSError, UnicodeDecodeError) as e:
+            raise TFStateError(f"Failed to read {tfstate}: {e}")
+        except TFStateError as e:
+            raise TFStateError(f"Failed to read {tfstate}: {e}")
+    
+    def summary(self, tfstate: Path) -> Optional[StateSummary]:
+        summary = load_summary(tfstate)
+        if summary is not None:
+            return summary
+        
+        # Sidecar missing or stale: read the full state once and refresh it
+        snapshot = self.load(tfstate)
+        if snapshot is None:
+            return None
+        
+        summary = StateSummary.from_snapshot(snapshot)
+        write_summary(tfstate, summary)
+        return summary
+
+
+TFSTATE_CACHE = TFStateCache()
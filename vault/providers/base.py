@@ -1,8 +1,8 @@
-import subprocess
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 from vault.core.lab import CloudProvider, Lab
+from vault.utils.probe import get_tool_probe
 
 
 class BaseProvider(ABC):
@@ -37,23 +37,23 @@ class BaseProvider(ABC):
     @abstractmethod
     def get_config_filename(self) -> str:
         pass
+    
+    def _check_tool(self, tool: str, display_name: str) -> bool:
+        probe = get_tool_probe().probe(tool)
+        
+        if not probe.path:
+            from vault.cli.formatting import log_error, log_info
+            log_error(f"{display_name} not found")
+            log_info("Run 'vault check' to see installation status")
+            log_info(f"Run 'vault install {tool}' for installation instructions")
+            return False
+        
+        return probe.installed
 
 
 class AWSProvider(BaseProvider):
     def check_prerequisites(self) -> bool:
-        try:
-            result = subprocess.run(
-                ["aws", "--version"],
-                capture_output=True,
-                check=False
-            )
-            return result.returncode == 0
-        except FileNotFoundError:
-            from vault.cli.formatting import log_error, log_info
-            log_error("AWS CLI not found")
-            log_info("Run 'vault check' to see installation status")
-            log_info("Run 'vault install aws' for installation instructions")
-            return False
+        return self._check_tool("aws", "AWS CLI")
     
     def get_var_files(self, lab: Lab) -> list[Path]:
         var_files = []
@@ -90,19 +90,7 @@ allowed_source_ips = ["YOUR_IP/32"]
 
 class AzureProvider(BaseProvider):
     def check_prerequisites(self) -> bool:
-        try:
-            result = subprocess.run(
-                ["az", "--version"],
-                capture_output=True,
-                check=False
-            )
-            return result.returncode == 0
-        except FileNotFoundError:
-            from vault.cli.formatting import log_error, log_info
-            log_error("Azure CLI not found")
-            log_info("Run 'vault check' to see installation status")
-            log_info("Run 'vault install az' for installation instructions")
-            return False
+        return self._check_tool("az", "Azure CLI")
     
     def get_var_files(self, lab: Lab) -> list[Path]:
         var_files = []
@@ -136,19 +124,7 @@ class AzureProvider(BaseProvider):
 
 class GCPProvider(BaseProvider):
     def check_prerequisites(self) -> bool:
-        try:
-            result = subprocess.run(
-                ["gcloud", "--version"],
-                capture_output=True,
-                check=False
-            )
-            return result.returncode == 0
-        except FileNotFoundError:
-            from vault.cli.formatting import log_error, log_info
-            log_error("gcloud CLI not found")
-            log_info("Run 'vault check' to see installation status")
-            log_info("Run 'vault install gcloud' for installation instructions")
-            return False
+        return self._check_tool("gcloud", "gcloud CLI")
     
     def get_var_files(self, lab: Lab) -> list[Path]:
         var_files = []
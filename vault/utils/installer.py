@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from vault.utils.probe import get_tool_probe
+
 
 class OS(str, Enum):
     LINUX = "linux"
@@ -65,31 +67,15 @@ class CSPInstaller:
             return False
     
     def check_installed(self, tool: str) -> tuple[bool, Optional[str]]:
-        version_commands = {
-            "aws": ["aws", "--version"],
-            "az": ["az", "version"],
-            "gcloud": ["gcloud", "version"],
-            "terraform": ["terraform", "version"],
+        probe = get_tool_probe().probe(tool)
+        return probe.installed, probe.version
+    
+    def check_installed_many(self, tools: list[str]) -> dict[str, tuple[bool, Optional[str]]]:
+        probes = get_tool_probe().probe_many(tools)
+        return {
+            tool: (probe.installed, probe.version)
+            for tool, probe in probes.items()
         }
-        
-        cmd = version_commands.get(tool)
-        if not cmd:
-            return False, None
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            if result.returncode == 0:
-                version_line = result.stdout.strip().split('\n')[0]
-                return True, version_line
-        except FileNotFoundError:
-            pass
-        
-        return False, None
     
     def get_install_instructions(self, tool: str) -> Optional[InstallCommand]:
         if tool == "aws":
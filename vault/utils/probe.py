@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+
+VERSION_COMMANDS: dict[str, list[str]] = {
+    "aws": ["aws", "--version"],
+    "az": ["az", "version"],
+    "gcloud": ["gcloud", "version"],
+    "terraform": ["terraform", "version"],
+}
+
+DEFAULT_CACHE_FILE = Path.home() / ".cache" / "vault" / "tool-probes.json"
+
+
+@dataclass
+class ProbeResult:
+    tool: str
+    installed: bool
+    version: Optional[str] = None
+    path: Optional[str] = None
+    mtime_ns: int = 0
+
+
+def _version_line(tool: str, output: str) -> Optional[str]:
+    if tool == "az":
+        # 'az version' prints a JSON document
+        try:
+            return f"azure-cli {json.loads(output)['azure-cli']}"
+        except (json.JSONDecodeError, KeyError, TypeError):
+            pass
+    
+    for line in output.splitlines():
+        if line.strip():
+            return line.strip()
+    return None
+
+
+class ToolProbe:
+    def __init__(self, cache_file: Path = DEFAULT_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._cache: Optional[dict[str, dict]] = None
+    
+    def _load_cache(self) -> dict[str, dict]:
+        if self._cache is None:
+            try:
+                self._cache = json.loads(self.cache_file.read_text())
+            except (OSError, json.JSONDecodeError):
+                self._cache = {}
+        return self._cache
+    
+    def _save_cache(self) -> None:
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(self._cache, indent=2))
+            tmp_file.replace(self.cache_file)
+        except OSError:
+            pass
+    
+    def _resolve(self, tool: str) -> tuple[Optional[str], int]:
+        binary = shutil.which(VERSION_COMMANDS[tool][0])
+        if not binary:
+            return None, 0
+        
+        resolved = os.path.realpath(binary)
+        try:
+            return resolved, os.stat(resolved).st_mtime_ns
+        except OSError:
+            return None, 0
+    
+    def _cached(self, tool: str, path: str, mtime_ns: int) -> Optional[ProbeResult]:
+        with self._lock:
+            entry = self._load_cache().get(tool)
+        
+        if entry and entry.get("path") == path and entry.get("mtime_ns") == mtime_ns:
+            return ProbeResult(**entry)
+        return None
+    
+    def _run_probe(self, tool: str, path: str, mtime_ns: int) -> ProbeResult:
+        try:
+            result = subprocess.run(
+                [path] + VERSION_COMMANDS[tool][1:],
+                capture_output=True,
+                text=True,
+                check=False
+            )
+        except OSError:
+            return ProbeResult(tool=tool, installed=False, path=path, mtime_ns=mtime_ns)
+        
+        # aws v1 prints its version on stderr
+        version = _version_line(tool, result.stdout or result.stderr)
+        return ProbeResult(
+            tool=tool,
+            installed=result.returncode == 0,
+            version=version if result.returncode == 0 else None,
+            path=path,
+            mtime_ns=mtime_ns
+        )
+    
+    def probe(self, tool: str, refresh: bool = False) -> ProbeResult:
+        return self.probe_many([tool], refresh=refresh)[tool]
+    
+    def probe_many(self, tools: list[str], refresh: bool = False) -> dict[str, ProbeResult]:
+        results: dict[str, ProbeResult] = {}
+        pending: list[tuple[str, str, int]] = []
+        
+        for tool in tools:
+            if tool not in VERSION_COMMANDS:
+                results[tool] = ProbeResult(tool=tool, installed=False)
+                continue
+            
+            path, mtime_ns = self._resolve(tool)
+            if not path:
+                results[tool] = ProbeResult(tool=tool, installed=False)
+                continue
+            
+            cached = None if refresh else self._cached(tool, path, mtime_ns)
+            if cached:
+                results[tool] = cached
+            else:
+                pending.append((tool, path, mtime_ns))
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                probed = list(executor.map(lambda args: self._run_probe(*args), pending))
+            
+            with self._lock:
+                cache = self._load_cache()
+                for result in probed:
+                    results[result.tool] = result
+                    # Failed probes are retried next time rather than pinned as missing
+                    if result.installed:
+                        cache[result.tool] = asdict(result)
+                    else:
+                        cache.pop(result.tool, None)
+                self._save_cache()
+        
+        return results
+
+
+_default_probe: Optional[ToolProbe] = None
+
+
+def get_tool_probe() -> ToolProbe:
+    global _default_probe
+    if _default_probe is None:
+        _default_probe = ToolProbe()
+    return _default_probe
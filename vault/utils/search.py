@@ -1,21 +1,123 @@
+import hashlib
+import json
+import os
 import re
 from pathlib import Path
 from typing import Optional
 
-from fuzzywuzzy import fuzz
-
+from vault.core.hcl import HCLIndex
 from vault.core.lab import CloudProvider, Difficulty, Lab, LabSearchResult
+from vault.utils.search_index import LabFacetIndex, LabSearchIndex
+
+
+CATALOG_FORMAT = 4
+
+
+class AmbiguousLabError(Exception):
+    def __init__(self, name: str, candidates: list[Lab]):
+        self.name = name
+        self.candidates = candidates
+        paths = ", ".join(lab.relative_path for lab in candidates)
+        super().__init__(f"'{name}' matches multiple labs: {paths}")
 
 
 class LabDiscovery:
-    def __init__(self, labs_dir: Path):
+    def __init__(
+        self,
+        labs_dir: Path,
+        cache_file: Optional[Path] = None,
+        hcl_index: Optional[HCLIndex] = None
+    ):
         self.labs_dir = labs_dir
+        self.cache_file = cache_file
+        self.hcl_index = hcl_index or HCLIndex()
+        self.catalog_version = ""
         self._lab_cache: Optional[list[Lab]] = None
+        self._search_index: Optional[LabSearchIndex] = None
+        self._facet_index: Optional[LabFacetIndex] = None
+        self._by_path: dict[str, Lab] = {}
+        self._by_name: dict[str, list[Lab]] = {}
+        self._by_id: dict[int, Lab] = {}
+        self._ids: dict[str, int] = {}
+    
+    def _read_catalog(self) -> tuple[dict[str, dict], dict[str, int]]:
+        if not self.cache_file:
+            return {}, {}
+        
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}, {}
+        
+        if data.get("labs_dir") != str(self.labs_dir.resolve()):
+            return {}, {}
+        
+        # IDs outlive format changes; only the cached entries are invalidated
+        entries = data.get("entries", {}) if data.get("format") == CATALOG_FORMAT else {}
+        return entries, data.get("ids", {})
+    
+    def _write_catalog(self, entries: dict[str, dict], ids: dict[str, int]) -> None:
+        if not self.cache_file:
+            return
+        
+        data = {
+            "format": CATALOG_FORMAT,
+            "labs_dir": str(self.labs_dir.resolve()),
+            "entries": entries,
+            "ids": ids
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(data))
+            tmp_file.replace(self.cache_file)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _mtime_ns(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return 0
+    
+    def _entry_mtimes(self, lab_dir: Path, module_dirs: list[str]) -> list[int]:
+        # Adding a .tf file changes the dir mtime; README and .tf edits only change their own
+        mtimes = [self._mtime_ns(lab_dir / "README.md")]
+        for directory in [lab_dir, *map(Path, module_dirs)]:
+            mtimes.append(self._mtime_ns(directory))
+            mtimes.append(max((self._mtime_ns(f) for f in directory.glob("*.tf")), default=0))
+        return mtimes
+    
+    def _lab_entry(self, lab_dir: Path, provider: CloudProvider) -> dict:
+        # Non-labs are cached too, so helper dirs like modules/ are not re-checked
+        if not (lab_dir / "main.tf").exists():
+            return {"lab": False}
+        
+        lab = self._create_lab(lab_dir, provider)
+        analysis = self.hcl_index.analyze(lab.terraform_dir)
+        return {
+            "lab": True,
+            "difficulty": lab.difficulty.rating,
+            "description": lab.description,
+            "estimated_time": lab.estimated_time,
+            "learning_objectives": lab.learning_objectives,
+            "resource_types": analysis.resource_types,
+            # Local modules feed resource_types, so their edits must refresh the entry
+            "module_dirs": [
+                str(config_dir) for config_dir in analysis.config_dirs
+                if config_dir != lab_dir.resolve()
+            ]
+        }
     
     def discover_labs(self, force_refresh: bool = False) -> list[Lab]:
         if self._lab_cache is not None and not force_refresh:
             return self._lab_cache
         
+        cached, cached_ids = self._read_catalog()
+        if force_refresh:
+            cached = {}
+        entries: dict[str, dict] = {}
         labs = []
         
         for provider_dir in self.labs_dir.iterdir():
@@ -31,15 +133,65 @@ class LabDiscovery:
                 if not lab_dir.is_dir():
                     continue
                 
-                if not (lab_dir / "main.tf").exists():
-                    continue
+                key = f"{provider.value}/{lab_dir.name}"
+                entry = cached.get(key)
+                module_dirs = entry.get("module_dirs", []) if entry else []
+                
+                if not entry or entry.get("mtimes") != self._entry_mtimes(lab_dir, module_dirs):
+                    entry = self._lab_entry(lab_dir, provider)
+                    # The rebuilt entry may reference a different set of modules
+                    entry["mtimes"] = self._entry_mtimes(lab_dir, entry.get("module_dirs", []))
+                entries[key] = entry
                 
-                lab = self._create_lab(lab_dir, provider)
-                labs.append(lab)
+                if entry["lab"]:
+                    labs.append(
+                        Lab(
+                            name=lab_dir.name,
+                            path=lab_dir,
+                            provider=provider,
+                            difficulty=(
+                                Difficulty(entry["difficulty"])
+                                if entry["difficulty"] else Difficulty.unknown()
+                            ),
+                            description=entry["description"],
+                            estimated_time=entry["estimated_time"],
+                            learning_objectives=entry["learning_objectives"],
+                            resource_types=entry["resource_types"]
+                        )
+                    )
         
         self._lab_cache = sorted(labs, key=lambda x: (x.provider.value, x.name))
+        ids = self._assign_ids(self._lab_cache, cached_ids)
+        
+        if entries != cached or ids != cached_ids:
+            self._write_catalog(entries, ids)
+        
+        self.catalog_version = hashlib.sha256(
+            json.dumps(entries, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        self._build_lookup(self._lab_cache, ids)
         return self._lab_cache
     
+    @staticmethod
+    def _assign_ids(labs: list[Lab], known: dict[str, int]) -> dict[str, int]:
+        # IDs are never reassigned: new labs get the next free number and
+        # removed or renamed labs retire theirs, so 'deploy 7' keeps its meaning
+        ids = dict(known)
+        next_id = max(ids.values(), default=0) + 1
+        for lab in labs:
+            if lab.relative_path not in ids:
+                ids[lab.relative_path] = next_id
+                next_id += 1
+        return ids
+    
+    def _build_lookup(self, labs: list[Lab], ids: dict[str, int]) -> None:
+        self._by_path = {lab.relative_path: lab for lab in labs}
+        self._by_name = {}
+        for lab in labs:
+            self._by_name.setdefault(lab.name, []).append(lab)
+        self._ids = {lab.relative_path: ids[lab.relative_path] for lab in labs}
+        self._by_id = {lab_id: self._by_path[path] for path, lab_id in self._ids.items()}
+    
     def _create_lab(self, lab_path: Path, provider: CloudProvider) -> Lab:
         lab = Lab(
             name=lab_path.name,
@@ -97,93 +249,84 @@ class LabDiscovery:
             pass
     
     def get_lab_by_path(self, lab_path: str) -> Optional[Lab]:
-        labs = self.discover_labs()
+        self.discover_labs()
         
-        for lab in labs:
-            if lab.relative_path == lab_path or lab.name == lab_path:
-                return lab
+        lab = self._by_path.get(lab_path.strip("/"))
+        if lab:
+            return lab
         
-        return None
+        matches = self._by_name.get(lab_path, [])
+        if len(matches) > 1:
+            raise AmbiguousLabError(lab_path, matches)
+        
+        return matches[0] if matches else None
+    
+    def get_lab_by_id(self, lab_id: int) -> Optional[Lab]:
+        self.discover_labs()
+        return self._by_id.get(lab_id)
     
-    def get_lab_by_index(self, index: int) -> Optional[Lab]:
+    def lab_ids(self) -> dict[str, int]:
+        self.discover_labs()
+        return dict(self._ids)
+    
+    def _get_search_index(self) -> LabSearchIndex:
         labs = self.discover_labs()
-        
-        if 0 <= index < len(labs):
-            return labs[index]
-        
-        return None
+        if self._search_index is None or self._search_index.version != self.catalog_version:
+            self._search_index = LabSearchIndex(labs, version=self.catalog_version)
+        return self._search_index
+    
+    def _get_facet_index(self) -> LabFacetIndex:
+        labs = self.discover_labs()
+        if self._facet_index is None or self._facet_index.version != self.catalog_version:
+            self._facet_index = LabFacetIndex(labs, version=self.catalog_version)
+        return self._facet_index
+    
+    def filter_labs(
+        self,
+        providers: Optional[list[str]] = None,
+        difficulties: Optional[list[int]] = None,
+        tags: Optional[list[str]] = None,
+        resource_types: Optional[list[str]] = None,
+        match_all: bool = False
+    ) -> list[Lab]:
+        labs = self.discover_labs()
+        selected = self._get_facet_index().select(
+            {
+                "provider": providers or [],
+                "difficulty": difficulties or [],
+                "tag": tags or [],
+                "resource_type": resource_types or []
+            },
+            match_all=match_all
+        )
+        return [labs[idx] for idx in sorted(selected)]
     
     def search_labs(
         self,
         query: str,
         provider: Optional[CloudProvider] = None,
         difficulty: Optional[Difficulty] = None,
-        min_score: int = 60
+        min_score: int = 10
     ) -> list[LabSearchResult]:
         labs = self.discover_labs()
         
-        if provider:
-            labs = [lab for lab in labs if lab.provider == provider]
-        
-        if difficulty:
-            labs = [lab for lab in labs if lab.difficulty == difficulty]
+        candidates = self._get_facet_index().select({
+            "provider": [provider.value] if provider else [],
+            "difficulty": [difficulty.rating] if difficulty else []
+        })
         
         if not query:
             return [
-                LabSearchResult(lab=lab, score=100.0, matched_fields=[])
-                for lab in labs
+                LabSearchResult(lab=labs[idx], score=100.0, matched_fields=[])
+                for idx in sorted(candidates)
             ]
         
-        results = []
-        query_lower = query.lower()
-        
-        for lab in labs:
-            score = 0
-            matched_fields = []
-            
-            name_score = fuzz.partial_ratio(query_lower, lab.name.lower())
-            if name_score > min_score:
-                score = max(score, name_score)
-                matched_fields.append("name")
-            
-            desc_score = fuzz.partial_ratio(query_lower, lab.description.lower())
-            if desc_score > min_score:
-                score = max(score, desc_score * 0.8)
-                matched_fields.append("description")
-            
-            for obj in lab.learning_objectives:
-                obj_score = fuzz.partial_ratio(query_lower, obj.lower())
-                if obj_score > min_score:
-                    score = max(score, obj_score * 0.7)
-                    if "objectives" not in matched_fields:
-                        matched_fields.append("objectives")
-            
-            if query_lower in lab.relative_path.lower():
-                score = max(score, 90)
-                if "path" not in matched_fields:
-                    matched_fields.append("path")
-            
-            if score > min_score:
-                results.append(
-                    LabSearchResult(
-                        lab=lab,
-                        score=score,
-                        matched_fields=matched_fields
-                    )
-                )
-        
-        return sorted(results, key=lambda x: x.score, reverse=True)
+        # Scores are relative to the best hit, so min_score drops weak matches
+        return [
+            LabSearchResult(lab=lab, score=score, matched_fields=matched_fields)
+            for lab, score, matched_fields in self._get_search_index().search(query, candidates)
+            if score >= min_score
+        ]
     
     def filter_by_tags(self, tags: list[str]) -> list[Lab]:
-        labs = self.discover_labs()
-        
-        tag_lower = [t.lower() for t in tags]
-        filtered = []
-        
-        for lab in labs:
-            lab_text = f"{lab.name} {lab.description} {' '.join(lab.learning_objectives)}".lower()
-            
-            if any(tag in lab_text for tag in tag_lower):
-                filtered.append(lab)
-        
-        return filtered
\ No newline at end of file
+        return self.filter_labs(tags=tags)
\ No newline at end of file
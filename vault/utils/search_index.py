@@ -0,0 +1,213 @@
+import math
+import re
+from collections import Counter
+from typing import Optional
+
+from vault.core.lab import Lab
+
+
+# Field boosts for BM25F; a name hit outranks the same word in a description
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "path": 2.0,
+    "resource_types": 1.5,
+    "description": 1.0,
+    "objectives": 1.0
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_TRIGRAM_SIMILARITY = 0.4
+PREFIX_WEIGHT = 0.8
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _lab_fields(lab: Lab) -> dict[str, list[str]]:
+    resource_tokens = []
+    for resource_type in lab.resource_types:
+        # Both "aws_iam_role" and its parts are searchable
+        resource_tokens.append(resource_type.lower())
+        resource_tokens.extend(tokenize(resource_type))
+    
+    return {
+        "name": tokenize(lab.name),
+        "path": tokenize(lab.relative_path),
+        "resource_types": resource_tokens,
+        "description": tokenize(lab.description),
+        "objectives": [t for objective in lab.learning_objectives for t in tokenize(objective)]
+    }
+
+
+class LabSearchIndex:
+    def __init__(self, labs: list[Lab], version: str = ""):
+        self.labs = labs
+        self.version = version
+        
+        # token -> {lab index -> {field -> term frequency}}
+        self.postings: dict[str, dict[int, dict[str, int]]] = {}
+        self.field_lengths: list[dict[str, int]] = []
+        self.avg_field_lengths: dict[str, float] = {}
+        self.trigram_index: dict[str, set[str]] = {}
+        
+        for doc_id, lab in enumerate(labs):
+            lengths = {}
+            for field_name, tokens in _lab_fields(lab).items():
+                lengths[field_name] = len(tokens)
+                for token, count in Counter(tokens).items():
+                    self.postings.setdefault(token, {}).setdefault(doc_id, {})[field_name] = count
+            self.field_lengths.append(lengths)
+        
+        for field_name in FIELD_WEIGHTS:
+            total = sum(lengths[field_name] for lengths in self.field_lengths)
+            self.avg_field_lengths[field_name] = total / len(labs) if labs else 0.0
+        
+        for token in self.postings:
+            for gram in trigrams(token):
+                self.trigram_index.setdefault(gram, set()).add(token)
+    
+    def _idf(self, token: str) -> float:
+        doc_count = len(self.postings.get(token, {}))
+        n = len(self.labs)
+        return math.log(1 + (n - doc_count + 0.5) / (doc_count + 0.5))
+    
+    def _expand(self, term: str) -> dict[str, float]:
+        # Exact token, then prefixes ("lamb" -> "lambda"), then trigram neighbours for typos
+        expansions: dict[str, float] = {}
+        if term in self.postings:
+            expansions[term] = 1.0
+        
+        if len(term) >= 3:
+            for token in self.postings:
+                if token != term and token.startswith(term):
+                    expansions[token] = max(expansions.get(token, 0.0), PREFIX_WEIGHT)
+        
+        term_grams = trigrams(term)
+        candidates: Counter[str] = Counter()
+        for gram in term_grams:
+            for token in self.trigram_index.get(gram, ()):
+                candidates[token] += 1
+        
+        for token, shared in candidates.items():
+            similarity = shared / len(term_grams | trigrams(token))
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                expansions[token] = max(expansions.get(token, 0.0), similarity)
+        
+        return expansions
+    
+    def _bm25(self, doc_id: int, fields: dict[str, int]) -> float:
+        score = 0.0
+        for field_name, tf in fields.items():
+            avg_length = self.avg_field_lengths[field_name] or 1.0
+            norm = 1 - BM25_B + BM25_B * self.field_lengths[doc_id][field_name] / avg_length
+            score += FIELD_WEIGHTS[field_name] * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return score
+    
+    def search(
+        self,
+        query: str,
+        candidates: Optional[set[int]] = None
+    ) -> list[tuple[Lab, float, list[str]]]:
+        scores: dict[int, float] = {}
+        matched: dict[int, set[str]] = {}
+        
+        for term in dict.fromkeys(tokenize(query)):
+            for token, weight in self._expand(term).items():
+                idf = self._idf(token)
+                for doc_id, fields in self.postings[token].items():
+                    if candidates is not None and doc_id not in candidates:
+                        continue
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * self._bm25(doc_id, fields)
+                    matched.setdefault(doc_id, set()).update(fields)
+        
+        if not scores:
+            return []
+        
+        # Scaled so the best hit is 100
+        best = max(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [
+            (
+                self.labs[doc_id],
+                100.0 * score / best,
+                [f for f in FIELD_WEIGHTS if f in matched[doc_id]]
+            )
+            for doc_id, score in ranked
+        ]
+
+
+FACETS = ("provider", "difficulty", "tag", "resource_type")
+
+
+def _lab_facets(lab: Lab) -> dict[str, set[str]]:
+    tags = set(tokenize(lab.name)) | set(tokenize(lab.description))
+    for objective in lab.learning_objectives:
+        tags.update(tokenize(objective))
+    
+    return {
+        "provider": {lab.provider.value},
+        "difficulty": {str(lab.difficulty.rating)},
+        "tag": tags,
+        "resource_type": {resource_type.lower() for resource_type in lab.resource_types}
+    }
+
+
+class LabFacetIndex:
+    def __init__(self, labs: list[Lab], version: str = ""):
+        self.labs = labs
+        self.version = version
+        
+        # facet -> value -> bitset of lab indexes
+        self.facets: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        
+        for doc_id, lab in enumerate(labs):
+            bit = 1 << doc_id
+            for facet, values in _lab_facets(lab).items():
+                postings = self.facets[facet]
+                for value in values:
+                    postings[value] = postings.get(value, 0) | bit
+    
+    def _value_bits(self, facet: str, value: str) -> int:
+        postings = self.facets[facet]
+        value = value.lower()
+        if facet != "tag":
+            return postings.get(value, 0)
+        
+        # Tags match by prefix, so "priv" still finds "privesc"
+        bits = 0
+        for tag, tag_bits in postings.items():
+            if tag.startswith(value):
+                bits |= tag_bits
+        return bits
+    
+    def select(
+        self,
+        filters: dict[str, list[str]],
+        match_all: bool = False
+    ) -> set[int]:
+        # Facets are ANDed; values within a facet are ORed unless match_all
+        bits = (1 << len(self.labs)) - 1
+        for facet, values in filters.items():
+            if not values:
+                continue
+            
+            value_bits = [self._value_bits(facet, str(value)) for value in values]
+            if match_all and facet in ("tag", "resource_type"):
+                for vb in value_bits:
+                    bits &= vb
+            else:
+                combined = 0
+                for vb in value_bits:
+                    combined |= vb
+                bits &= combined
+        
+        return {doc_id for doc_id in range(len(self.labs)) if bits >> doc_id & 1}
\ No newline at end of file